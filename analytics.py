@@ -0,0 +1,903 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from loader import recode
+
+SUBMISSION_KEYS = ["Spotify URI", "Round ID"]
+
+
+def _submission_facts(submissions, points, player_names, round_names):
+    facts = submissions.merge(points, left_on=SUBMISSION_KEYS, right_index=True, how="left")
+    facts["Total Points"] = facts["Total Points"].fillna(0).astype("int64")
+    facts["Round"] = facts["Round ID"].map(round_names).astype("string")
+    facts["Username"] = facts["Submitter ID"].map(player_names).astype("string")
+    return facts
+
+
+def _song_points(vote_facts):
+    return vote_facts.groupby(SUBMISSION_KEYS, observed=True)["Points Assigned"].sum().rename("Total Points")
+
+
+def _pair_points(vote_facts):
+    return (
+        vote_facts.groupby(["Voter ID", "Submitter ID"], observed=True)["Points Assigned"]
+        .sum()
+        .rename("Points")
+        .reset_index()
+    )
+
+
+def _lookups(rounds, competitors):
+    player_names = competitors.set_index("ID")["Name"]
+    round_names = rounds.set_index("ID")["Name"]
+    return player_names, round_names
+
+
+def build_facts(votes, submissions, rounds, competitors):
+    """Canonical per-season fact tables shared by every tab.
+
+    `votes` has one row per vote joined to its submitter on (Spotify URI, Round ID).
+    It stays on the loader's categorical IDs, so joins and groupbys run on integer
+    codes; names are decoded after aggregating through the `players` and `rounds`
+    lookup tables (ID -> name). `submissions` has one row per submission with its
+    round, username and the total points it received, and `pairs` has the points
+    each voter gave each submitter. Both totals are additive, see `extend_facts`.
+    """
+    player_names, round_names = _lookups(rounds, competitors)
+
+    vote_facts = votes.merge(
+        submissions[SUBMISSION_KEYS + ["Submitter ID"]],
+        on=SUBMISSION_KEYS,
+        how="left"
+    )
+
+    return {
+        "votes": vote_facts,
+        "submissions": _submission_facts(submissions, _song_points(vote_facts), player_names, round_names),
+        "pairs": _pair_points(vote_facts),
+        "players": player_names.set_axis(player_names.index.astype(str)),
+        "rounds": round_names.set_axis(round_names.index.astype(str)),
+    }
+
+
+def _recast(frame, dtypes):
+    """`frame` with its categorical columns moved onto `dtypes` (a column -> dtype mapping)."""
+    return frame.assign(**{
+        column: recode(frame[column], dtype) for column, dtype in dtypes.items()
+        if column in frame.columns and isinstance(dtype, pd.CategoricalDtype)
+    })
+
+
+def _key_codes(frame):
+    return pd.MultiIndex.from_arrays([frame[key].cat.codes for key in SUBMISSION_KEYS])
+
+
+def extend_facts(facts, data, delta):
+    """`build_facts(**data)` for a season where `delta` rows were just appended, from the new rows only.
+
+    Song and pair totals get the new votes added instead of being regrouped. Returns the
+    facts and the changes the `extend_*` functions apply to tables built from the old facts:
+    every song that is new or got points ("songs": Username, Before, Total Points, New), the
+    new votes' pair totals ("pairs"), and whether players were added ("new_players").
+    Returns None when the new rows change how earlier rows match (a song resubmitted under
+    an existing key, or earlier votes that were waiting for their submission); rebuild then.
+    """
+    submissions = data["submissions"]
+    dtypes = {**data["votes"].dtypes.to_dict(), "Submitter ID": submissions["Submitter ID"].dtype}
+    old_votes = _recast(facts["votes"], dtypes)
+    old_submissions = _recast(facts["submissions"], submissions.dtypes.to_dict())
+    old_pairs = _recast(facts["pairs"], dtypes)
+
+    new_keys = _key_codes(delta["submissions"])
+    if new_keys.isin(_key_codes(old_submissions)).any():
+        return None
+    waiting = old_votes[old_votes["Submitter ID"].isna()]
+    if len(waiting) and _key_codes(waiting).isin(new_keys).any():
+        return None
+
+    player_names, round_names = _lookups(data["rounds"], data["competitors"])
+    new_votes = delta["votes"].merge(submissions[SUBMISSION_KEYS + ["Submitter ID"]], on=SUBMISSION_KEYS, how="left")
+    points = _song_points(new_votes)
+    points.index = pd.MultiIndex.from_arrays([points.index.get_level_values(key).codes for key in SUBMISSION_KEYS])
+
+    added = points.reindex(_key_codes(old_submissions), fill_value=0).to_numpy()
+    old_submissions["Total Points"] += added
+    if old_submissions["Round"].isna().any() or old_submissions["Username"].isna().any():
+        # Rounds or players that were missing before may have just been exported
+        old_submissions["Round"] = old_submissions["Round ID"].map(round_names).astype("string")
+        old_submissions["Username"] = old_submissions["Submitter ID"].map(player_names).astype("string")
+    new_submissions = _submission_facts(delta["submissions"], _song_points(new_votes), player_names, round_names)
+    if len(new_submissions):
+        submission_facts = pd.concat([old_submissions, new_submissions], ignore_index=True)
+    else:
+        submission_facts = old_submissions
+
+    new_pairs = _pair_points(new_votes)
+    pairs = _recast(pd.concat([old_pairs, new_pairs], ignore_index=True), dtypes)
+    touched = old_submissions[added != 0]
+    songs = pd.concat([
+        pd.DataFrame({
+            "Username": touched["Username"],
+            "Before": touched["Total Points"] - added[added != 0],
+            "Total Points": touched["Total Points"],
+            "New": False,
+        }),
+        pd.DataFrame({"Username": new_submissions["Username"], "Before": 0, "Total Points": new_submissions["Total Points"], "New": True}),
+    ], ignore_index=True)
+    return {
+        "votes": _recast(pd.concat([old_votes, new_votes], ignore_index=True), dtypes),
+        "submissions": _recast(submission_facts, submissions.dtypes.to_dict()),
+        "pairs": pairs.groupby(["Voter ID", "Submitter ID"], observed=True)["Points"].sum().reset_index(),
+        "players": player_names.set_axis(player_names.index.astype(str)),
+        "rounds": round_names.set_axis(round_names.index.astype(str)),
+    }, {"songs": songs, "pairs": new_pairs, "new_players": len(delta["competitors"]) > 0}
+
+
+def round_participation(submissions, rounds):
+    """Number of distinct submitters per round, oldest round first."""
+    participation = (
+        submissions.groupby("Round ID", observed=True)["Submitter ID"]
+        .nunique()
+        .reset_index()
+        .rename(columns={"Submitter ID": "Number of Participants"})
+    )
+    participation = participation.merge(
+        rounds[["ID", "Name", "Created"]],
+        left_on="Round ID",
+        right_on="ID",
+        how="left"
+    )
+    participation = participation[["Name", "Created", "Number of Participants"]]
+    participation = participation.rename(columns={"Name": "Round Name", "Created": "Created At"})
+    participation = participation.sort_values("Created At").reset_index(drop=True)
+    participation["Created At"] = participation["Created At"].dt.date
+    return participation
+
+
+def _decode(ids, names):
+    """Map aggregated categorical IDs to display names through a lookup table."""
+    return ids.astype(str).map(names).astype("string")
+
+
+def leaderboard(facts):
+    """Total points received per player, highest first."""
+    points = facts["submissions"].groupby("Submitter ID", observed=True)["Total Points"].sum().reset_index()
+    points["Username"] = _decode(points["Submitter ID"], facts["players"])
+    board = points.groupby("Username")["Total Points"].sum().reset_index()
+    board.columns = ["Username", "Total Points"]
+    return board.sort_values(by="Total Points", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def extend_leaderboard(board, changes):
+    """`leaderboard` after appended rows, from the points each changed song gained; None if players were added."""
+    if changes["new_players"]:
+        return None
+    songs = changes["songs"]
+    gained = pd.DataFrame({"Username": songs["Username"], "Total Points": songs["Total Points"] - songs["Before"]})
+    board = pd.concat([board, gained]).groupby("Username")["Total Points"].sum().reset_index()
+    return board.sort_values(by="Total Points", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def round_points(facts, rounds):
+    """Points each player received per round (Round ID, Round, Created, Username, Points), the input to `standings`."""
+    points = (
+        facts["submissions"].groupby(["Round ID", "Username"], observed=True)["Total Points"]
+        .sum()
+        .rename("Points")
+        .reset_index()
+    )
+    points["Round ID"] = points["Round ID"].astype(str)
+    rounds = rounds.assign(ID=rounds["ID"].astype(str)).drop_duplicates("ID").set_index("ID")
+    points.insert(1, "Round", points["Round ID"].map(rounds["Name"]).astype("string"))
+    points.insert(2, "Created", points["Round ID"].map(rounds["Created"]))
+    return points
+
+
+def standings(points):
+    """Cumulative points and rank of every player after each round, oldest round first.
+
+    One cumulative sum down a dense round x player grid built from `round_points`; players
+    carry their total through rounds they skipped. Ties share the better rank.
+    """
+    order = points.drop_duplicates("Round ID").sort_values(["Created", "Round ID"], kind="stable")
+    round_ids = pd.Index(order["Round ID"])
+    players = pd.Index(sorted(points["Username"].dropna().unique()))
+    grid = _code_matrix(
+        round_ids.get_indexer(points["Round ID"]),
+        players.get_indexer(points["Username"]),
+        (len(round_ids), len(players)),
+        points["Points"].to_numpy(dtype="float64"),
+    )
+    totals = grid.cumsum(axis=0)
+    ranks = pd.DataFrame(totals).rank(axis=1, method="min", ascending=False).to_numpy(dtype="int64")
+    table = pd.DataFrame({
+        "Round Number": np.repeat(np.arange(1, len(round_ids) + 1), len(players)),
+        "Round": np.repeat(order["Round"].to_numpy(), len(players)),
+        "Username": np.tile(players.to_numpy(), len(round_ids)),
+        "Points": grid.ravel(),
+        "Cumulative Points": totals.ravel(),
+        "Rank": ranks.ravel(),
+    })
+    return table.sort_values(["Round Number", "Rank", "Username"], kind="stable").reset_index(drop=True)
+
+
+def lead_changes(table):
+    """Rounds after which the leader changed (the first round included); tied leaders are joined with " / "."""
+    leaders = (
+        table[table["Rank"] == 1]
+        .groupby(["Round Number", "Round"], dropna=False, sort=True)
+        .agg(Leader=("Username", " / ".join), **{"Cumulative Points": ("Cumulative Points", "first")})
+        .reset_index()
+    )
+    return leaders[leaders["Leader"].ne(leaders["Leader"].shift())].reset_index(drop=True)
+
+
+def standings_chart_data(table, top_n=10, max_rounds=None):
+    """`standings` cut down for charts: the final top `top_n` players, and at most `max_rounds` evenly spaced rounds (the last always kept)."""
+    final = table[table["Round Number"] == table["Round Number"].max()]
+    table = table[table["Username"].isin(final["Username"].head(top_n))]
+    rounds = table["Round Number"].unique()
+    if max_rounds and len(rounds) > max_rounds:
+        keep = rounds[np.unique(np.linspace(0, len(rounds) - 1, max_rounds).round().astype(int))]
+        table = table[table["Round Number"].isin(keep)]
+    return table.reset_index(drop=True)
+
+
+def season_metrics(facts, competitors):
+    vote_facts, submission_facts = facts["votes"], facts["submissions"]
+    return {
+        "Total Songs Submitted": len(submission_facts),
+        "Total Votes Cast": len(vote_facts),
+        "Average Votes per Song": float(
+            vote_facts.groupby(SUBMISSION_KEYS, observed=True)["Points Assigned"].sum().mean()
+        ),
+        "Total Players": len(competitors),
+        "Average Points per Player": float(
+            vote_facts.groupby("Submitter ID", observed=True)["Points Assigned"].sum().mean()
+        ),
+    }
+
+
+def top_artists(submissions, n=10):
+    artists = submissions["Primary Artist"].value_counts().reset_index()
+    artists.columns = ["Artist", "Submission Count"]
+    return artists.head(n)
+
+
+def top_songs(submissions, n=10):
+    """Songs submitted more than once, most submitted first."""
+    songs = submissions.groupby(["Title", "Primary Artist"], observed=True).size().reset_index(name="Submission Count")
+    songs = songs[songs["Submission Count"] > 1].sort_values(by="Submission Count", ascending=False, kind="stable")
+    return songs.head(n).reset_index(drop=True)
+
+
+def heatmap_points(facts):
+    """Voter -> submitter point totals as a sparse long frame (Voter, Submitter, Points).
+
+    Read from the integer-coded pair totals; only pairs that actually voted are kept, and
+    names are decoded for those rows alone.
+    """
+    points = facts["pairs"]
+    return pd.DataFrame({
+        "Voter": _decode(points["Voter ID"], facts["players"]),
+        "Submitter": _decode(points["Submitter ID"], facts["players"]),
+        "Points": points["Points"].astype("int64"),
+    }).dropna(subset=["Voter", "Submitter"]).reset_index(drop=True)
+
+
+def extend_heatmap_points(points, changes, players):
+    """`heatmap_points` after appended rows, with the new votes' pair totals added; None if players were added.
+
+    `players` is the facts' ID -> name lookup. Rows come back grouped by (Voter, Submitter) name.
+    """
+    if changes["new_players"]:
+        return None
+    new_points = heatmap_points({"pairs": changes["pairs"], "players": players})
+    return pd.concat([points, new_points]).groupby(["Voter", "Submitter"], sort=False)["Points"].sum().reset_index()
+
+
+def _cluster_order(matrix):
+    """Row order from divisive hierarchical clustering: sort on the first principal component, halve, recurse."""
+    def split(rows):
+        block = matrix[rows].astype("float64")
+        block -= block.mean(axis=0)
+        if len(rows) <= 2 or not block.any():
+            return list(rows)
+        projection = block @ np.linalg.svd(block, full_matrices=False)[2][0]
+        rows = rows[np.argsort(projection, kind="stable")]
+        return split(rows[:len(rows) // 2]) + split(rows[len(rows) // 2:])
+    return np.array(split(np.arange(len(matrix))), dtype=np.int64)
+
+
+def _tiles(matrix, labels, max_size, axis):
+    """Average consecutive rows (axis=0) or columns (axis=1) into at most `max_size` tiles."""
+    size = -(-len(labels) // max_size)
+    if size <= 1:
+        return matrix, labels
+    starts = np.arange(0, len(labels), size)
+    ends = np.minimum(starts + size, len(labels))
+    counts = (ends - starts).reshape((-1, 1) if axis == 0 else (1, -1))
+    tiled = np.add.reduceat(matrix, starts, axis=axis) / counts
+    return tiled, pd.Index([f"{labels[a]} … {labels[b - 1]}" for a, b in zip(starts, ends)])
+
+
+def heatmap_matrix(points, order="name", top_n=None, players=None, max_size=None):
+    """Voter x submitter matrix from `heatmap_points`, densified only for the players shown.
+
+    `players` keeps just those names; otherwise `top_n` keeps the top voters by points
+    given and top submitters by points received. `order` is "name" or "cluster" (similar voting
+    patterns next to each other). Axes longer than `max_size` are averaged into tiles.
+    """
+    points = points.groupby(["Voter", "Submitter"])["Points"].sum().reset_index()
+    if players:
+        points = points[points["Voter"].isin(players) & points["Submitter"].isin(players)]
+    elif top_n:
+        voters = points.groupby("Voter")["Points"].sum().nlargest(top_n).index
+        submitters = points.groupby("Submitter")["Points"].sum().nlargest(top_n).index
+        points = points[points["Voter"].isin(voters) & points["Submitter"].isin(submitters)]
+
+    if players:
+        voters = submitters = pd.Index(sorted(set(players)))
+    else:
+        voters, submitters = pd.Index(sorted(points["Voter"].unique())), pd.Index(sorted(points["Submitter"].unique()))
+    matrix = np.zeros((len(voters), len(submitters)), dtype=np.int64)
+    matrix[voters.get_indexer(points["Voter"]), submitters.get_indexer(points["Submitter"])] = points["Points"]
+
+    if order == "cluster" and matrix.size:
+        rows, columns = _cluster_order(matrix), _cluster_order(matrix.T)
+        matrix, voters, submitters = matrix[rows][:, columns], voters[rows], submitters[columns]
+    if max_size:
+        matrix, voters = _tiles(matrix, voters, max_size, axis=0)
+        matrix, submitters = _tiles(matrix, submitters, max_size, axis=1)
+        matrix = matrix.round(1)
+    return pd.DataFrame(matrix, index=voters, columns=submitters).rename_axis(index="Voter Name", columns="Submitter Name")
+
+
+def voting_heatmap(facts):
+    """Voter x submitter matrix of total points given."""
+    return heatmap_matrix(heatmap_points(facts))
+
+
+def vote_vectors(facts):
+    """Voter name, song code and points for every vote on a known submission: the input to `voter_similarity`."""
+    votes = facts["votes"]
+    votes = votes[votes["Submitter ID"].notna()]
+    names = votes["Voter ID"].cat.categories.astype(str).map(facts["players"]).to_numpy(dtype=object)
+    voters = _codes(votes["Voter ID"])
+    songs = _codes(votes["Spotify URI"]).astype(np.int64) * len(votes["Round ID"].cat.categories) + _codes(votes["Round ID"])
+    return pd.DataFrame({
+        "Voter": pd.Series(np.where(voters >= 0, names[voters], None), dtype="string"),
+        "Song": songs,
+        "Points": votes["Points Assigned"].to_numpy(dtype="int64"),
+    }).dropna(subset=["Voter"]).reset_index(drop=True)
+
+
+def _gram(groups, rows, weights, n, chunk=1 << 22):
+    """V Vᵀ for a sparse rows x groups matrix V given as (row, group, weight) entries.
+
+    Every pair of entries in the same group adds the product of their weights, so only
+    co-votes are touched; pairs are expanded `chunk` at a time to bound memory.
+    """
+    order = np.argsort(groups, kind="stable")
+    groups, rows, weights = groups[order], rows[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    sizes = np.diff(np.r_[starts, len(groups)])
+    size, start = np.repeat(sizes, sizes), np.repeat(starts, sizes)
+    ends = np.cumsum(size)
+    gram = np.zeros(n * n)
+    begin = 0
+    while begin < len(groups):
+        end = max(begin + 1, int(np.searchsorted(ends, ends[begin] - size[begin] + chunk, side="right")))
+        counts = size[begin:end]
+        left = np.repeat(np.arange(begin, end), counts)
+        right = np.repeat(start[begin:end], counts) + np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+        gram += np.bincount(rows[left] * n + rows[right], weights=weights[left] * weights[right], minlength=n * n)
+        begin = end
+    return gram.reshape(n, n)
+
+
+def voter_similarity(vectors, song_count, method="cosine"):
+    """Voter x voter similarity of the points each gave across the season's `song_count` songs.
+
+    `method` is "cosine" or "correlation" (Pearson, with each voter centred on their mean over
+    every song). Both come from one Gram matrix of the sparse voter x song points, so the
+    vectors are never densified. Voters who gave no points are left out.
+    """
+    vectors = vectors.groupby(["Voter", "Song"])["Points"].sum().reset_index()
+    vectors = vectors[vectors["Points"] != 0]
+    voters, names = pd.factorize(vectors["Voter"], sort=True)
+    points = vectors["Points"].to_numpy(dtype="float64")
+    gram = _gram(vectors["Song"].to_numpy(), voters, points, len(names))
+    if method == "correlation":
+        sums = np.bincount(voters, weights=points, minlength=len(names))
+        gram -= np.outer(sums, sums) / max(song_count, 1)
+    norms = np.sqrt(np.clip(np.diag(gram), 0, None))
+    keep = norms > 0
+    similarity = (gram / np.outer(np.where(keep, norms, 1), np.where(keep, norms, 1)))[keep][:, keep]
+    names = pd.Index(names[keep], name="Voter")
+    return pd.DataFrame(np.clip(similarity, -1, 1), index=names, columns=names.rename("Other Voter"))
+
+
+def most_similar_voters(similarity):
+    """Each voter's closest match in `voter_similarity`, most alike pairs first."""
+    values = similarity.to_numpy(copy=True)
+    if len(values) < 2:
+        return pd.DataFrame(columns=["Username", "Most Similar Voter", "Similarity"])
+    np.fill_diagonal(values, -np.inf)
+    best = values.argmax(axis=1)
+    closest = pd.DataFrame({
+        "Username": similarity.index.to_numpy(),
+        "Most Similar Voter": similarity.columns.to_numpy()[best],
+        "Similarity": values[np.arange(len(values)), best].round(3),
+    })
+    return closest.sort_values("Similarity", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def voting_blocs(similarity, n_blocs=3, iterations=100):
+    """Voters grouped into `n_blocs` blocs that vote alike, largest bloc first.
+
+    Spectral clustering on the positive similarities: k-means over the leading eigenvectors,
+    seeded with farthest-point picks so results are stable between runs. "Cohesion" is a
+    voter's mean similarity to the rest of their bloc.
+    """
+    n_blocs = min(n_blocs, len(similarity))
+    if n_blocs < 1:
+        return pd.DataFrame(columns=["Username", "Bloc", "Cohesion"])
+    affinity = np.clip(similarity.to_numpy(), 0, None)
+    scale = 1 / np.sqrt(np.maximum(affinity.sum(axis=1), 1e-12))
+    embedding = np.linalg.eigh(affinity * np.outer(scale, scale))[1][:, -n_blocs:]
+    embedding /= np.maximum(np.linalg.norm(embedding, axis=1, keepdims=True), 1e-12)
+
+    seeds = [0]
+    for _ in range(n_blocs - 1):
+        distance = ((embedding[:, None] - embedding[seeds][None]) ** 2).sum(axis=2).min(axis=1)
+        seeds.append(int(distance.argmax()))
+    centers = embedding[seeds]
+    for _ in range(iterations):
+        labels = ((embedding[:, None] - centers[None]) ** 2).sum(axis=2).argmin(axis=1)
+        moved = np.array([embedding[labels == k].mean(axis=0) if (labels == k).any() else centers[k] for k in range(n_blocs)])
+        if np.allclose(moved, centers):
+            break
+        centers = moved
+
+    # Renumber so bloc 1 is the largest
+    ranking = np.argsort(-np.bincount(labels, minlength=n_blocs), kind="stable")
+    labels = np.argsort(ranking)[labels]
+    same = labels[:, None] == labels[None]
+    np.fill_diagonal(same, False)
+    cohesion = (similarity.to_numpy() * same).sum(axis=1) / np.maximum(same.sum(axis=1), 1)
+    blocs = pd.DataFrame({"Username": similarity.index.to_numpy(), "Bloc": labels + 1, "Cohesion": cohesion.round(3)})
+    return blocs.sort_values(["Bloc", "Cohesion"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+
+def bloc_matrix(similarity, blocs, max_size=None):
+    """`similarity` with voters ordered by bloc (and cohesion within it), averaged into tiles past `max_size`."""
+    order = pd.Index(blocs["Username"])
+    matrix = similarity.loc[order, order].to_numpy()
+    rows = columns = order
+    if max_size:
+        matrix, rows = _tiles(matrix, order, max_size, axis=0)
+        matrix, columns = _tiles(matrix, order, max_size, axis=1)
+    return pd.DataFrame(matrix.round(3), index=rows, columns=columns).rename_axis(index="Voter", columns="Other Voter")
+
+
+def snub_counts(facts):
+    """Zero-point songs and total songs per player, the input to `snub_ranking`."""
+    submission_facts = facts["submissions"]
+    return (
+        submission_facts.assign(**{"Zero Vote Songs": submission_facts["Total Points"].eq(0)})
+        .groupby("Username")
+        .agg(**{"Zero Vote Songs": ("Zero Vote Songs", "sum"), "Total Submissions": ("Total Points", "size")})
+        .reset_index()
+    )
+
+
+def extend_snub_counts(counts, changes):
+    """`snub_counts` after appended rows: new songs are counted and songs that got their first points leave the zeros.
+
+    None if players were added.
+    """
+    if changes["new_players"]:
+        return None
+    songs = changes["songs"]
+    zeros = songs["Total Points"].eq(0).astype("int64") - (songs["Before"].eq(0) & ~songs["New"]).astype("int64")
+    delta = pd.DataFrame({
+        "Username": songs["Username"],
+        "Zero Vote Songs": zeros,
+        "Total Submissions": songs["New"].astype("int64"),
+    })
+    return pd.concat([counts, delta]).groupby("Username")[["Zero Vote Songs", "Total Submissions"]].sum().reset_index()
+
+
+def snub_rates(facts, min_submissions=2):
+    """Players ranked by the share of their songs that got zero points."""
+    return snub_ranking(snub_counts(facts), min_submissions)
+
+
+def snub_ranking(counts, min_submissions=2):
+    """`snub_rates` from per-player `snub_counts`."""
+    stats = counts[counts["Zero Vote Songs"] > 0].reset_index(drop=True)
+    stats["Snub Rate (%)"] = (stats["Zero Vote Songs"] / stats["Total Submissions"] * 100).round(1)
+
+    ranked = stats[stats["Total Submissions"] >= min_submissions]
+    ranked = ranked.sort_values(by="Snub Rate (%)", ascending=False, kind="stable").reset_index(drop=True)
+    ranked.insert(0, "Rank", range(1, len(ranked) + 1))
+    return ranked[["Rank", "Username", "Zero Vote Songs", "Total Submissions", "Snub Rate (%)"]]
+
+
+def explore_table(facts):
+    return facts["submissions"][["Round", "Username", "Title", "Primary Artist", "Total Points"]].rename(columns={
+        "Round": "Round Name",
+        "Title": "Song Name",
+        "Primary Artist": "Artist Name",
+        "Total Points": "Number of Votes",
+    })
+
+
+SEARCH_COLUMNS = ["Title", "Album", "Artist(s)", "Comment"]
+
+
+def _tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def _positions(keys, positions):
+    """{key: sorted row positions} for every non-null key."""
+    frame = pd.DataFrame({"key": keys, "position": positions}).dropna().drop_duplicates()
+    return {key: group.to_numpy() for key, group in frame.groupby("key", observed=True, sort=False)["position"]}
+
+
+def explore_index(facts):
+    """The Explore table plus lookups by username, round and artist and a token index for search.
+
+    Built once per season; every filter is then an intersection of sorted position arrays.
+    """
+    table = explore_table(facts)
+    submission_facts = facts["submissions"]
+    positions = np.arange(len(table))
+
+    words = pd.concat([submission_facts[column].str.lower().str.findall(r"\w+") for column in SEARCH_COLUMNS])
+    words = pd.DataFrame({"token": words.to_numpy(), "position": np.tile(positions, len(SEARCH_COLUMNS))}).explode("token")
+    tokens = _positions(words["token"], words["position"])
+
+    return {
+        "table": table,
+        "username": _positions(table["Username"].to_numpy(), positions),
+        "round": _positions(table["Round Name"].to_numpy(), positions),
+        "artist": _positions(table["Artist Name"].to_numpy(), positions),
+        "token_list": np.array(sorted(tokens), dtype=object),
+        "tokens": tokens,
+    }
+
+
+def _prefix_matches(index, prefix):
+    """Positions of rows with any token starting with `prefix`, from a binary search over the sorted tokens."""
+    tokens = index["token_list"]
+    start = np.searchsorted(tokens, prefix)
+    end = np.searchsorted(tokens, prefix + "\uffff")
+    if start == end:
+        return np.array([], dtype=np.int64)
+    return np.unique(np.concatenate([index["tokens"][token] for token in tokens[start:end]]))
+
+
+def explore_search(index, username=None, round_name=None, artist=None, text=None):
+    """Row positions matching every given filter; `text` matches word prefixes in title, album, artists and comment."""
+    matches = np.arange(len(index["table"]))
+    for key, value in (("username", username), ("round", round_name), ("artist", artist)):
+        if value is not None:
+            matches = np.intersect1d(matches, index[key].get(value, []), assume_unique=True)
+    for token in _tokens(text or ""):
+        matches = np.intersect1d(matches, _prefix_matches(index, token), assume_unique=True)
+    return matches
+
+
+def explore_page(index, matches, page, page_size):
+    """One page (1-based) of the Explore table for `matches`."""
+    start = (page - 1) * page_size
+    return index["table"].iloc[matches[start:start + page_size]]
+
+
+def _codes(series):
+    return series.cat.codes.to_numpy()
+
+
+def _code_matrix(rows, cols, shape, weights=None):
+    """Dense rows x cols sums of `weights` (or counts) over integer category codes; missing (-1) codes are dropped."""
+    keep = (rows >= 0) & (cols >= 0)
+    flat = rows[keep].astype(np.int64) * shape[1] + cols[keep]
+    weights = None if weights is None else weights[keep]
+    return np.bincount(flat, weights=weights, minlength=shape[0] * shape[1]).reshape(shape).astype(np.int64)
+
+
+def _pair_index(ids, targets, voters):
+    """(Target ID, Voter ID) index over positions in `ids`, kept as integer codes into one level."""
+    return pd.MultiIndex(levels=[ids, ids], codes=[targets, voters], names=["Target ID", "Voter ID"])
+
+
+def hate_matrix(facts, rounds, competitors):
+    """Hate points for every (target, voter) pair in a season.
+
+    Hate = (points a voter had in a round) - (points they gave the target), summed over
+    the rounds where the target had songs. Returned as a long frame indexed by
+    (Target ID, Voter ID) so a player's haters are a single lookup.
+    """
+    vote_facts, submission_facts = facts["votes"], facts["submissions"]
+    ids = competitors["ID"].astype(str).to_numpy()
+    players, round_codes = _codes(competitors["ID"]), _codes(rounds["ID"])
+    shape = (len(competitors["ID"].cat.categories), len(rounds["ID"].cat.categories))
+    voters, points = _codes(vote_facts["Voter ID"]), vote_facts["Points Assigned"].to_numpy()
+
+    # Voter x round points handed out, and which rounds each target had songs in
+    totals = _code_matrix(voters, _codes(vote_facts["Round ID"]), shape, points)[np.ix_(players, round_codes)]
+    had_songs = _code_matrix(
+        _codes(submission_facts["Submitter ID"]), _codes(submission_facts["Round ID"]), shape
+    )[np.ix_(players, round_codes)] > 0
+    # Points each voter had in the rounds where each target had songs
+    exposed = totals @ had_songs.T
+    pairs = facts["pairs"]
+    given = _code_matrix(
+        _codes(pairs["Voter ID"]), _codes(pairs["Submitter ID"]), (shape[0], shape[0]), pairs["Points"].to_numpy()
+    )[np.ix_(players, players)]
+
+    n = len(ids)
+    targets, voter_positions = np.repeat(np.arange(n), n), np.tile(np.arange(n), n)
+    hate = pd.DataFrame({
+        "Hater": competitors["Name"].to_numpy()[voter_positions],
+        "Hate Points": (exposed - given).T.ravel(),
+        "Points Available": totals.sum(axis=1)[voter_positions],
+        "Points Given to You": given.T.ravel(),
+    }, index=_pair_index(ids, targets, voter_positions))
+    return hate[targets != voter_positions]
+
+
+def allocation_matrix(facts, competitors):
+    """How every voter split their points, for every (target, voter) pair in a season.
+
+    Covers each voter who cast at least one vote: total points used, points given to
+    the target and the rest as hate points. Indexed by
+    (Target ID, Voter ID) like `hate_matrix`.
+    """
+    vote_facts = facts["votes"]
+    ids = competitors["ID"].astype(str).to_numpy()
+    players = _codes(competitors["ID"])
+    size = len(competitors["ID"].cat.categories)
+    voters, points = _codes(vote_facts["Voter ID"]), vote_facts["Points Assigned"].to_numpy()
+
+    pairs = facts["pairs"]
+    given = _code_matrix(
+        _codes(pairs["Voter ID"]), _codes(pairs["Submitter ID"]), (size, size), pairs["Points"].to_numpy()
+    )[np.ix_(players, players)]
+    cast = voters >= 0
+    vote_counts = np.bincount(voters[cast], minlength=size)[players]
+    points_used = np.bincount(voters[cast], weights=points[cast], minlength=size).astype(np.int64)[players]
+    voter_positions = np.flatnonzero(vote_counts > 0)
+
+    n = len(ids)
+    targets, voter_positions = np.repeat(np.arange(n), len(voter_positions)), np.tile(voter_positions, n)
+    allocation = pd.DataFrame({
+        "Voter": competitors["Name"].to_numpy()[voter_positions],
+        "Total Points Used": points_used[voter_positions],
+        "Points to Target": given[voter_positions, targets],
+    }, index=_pair_index(ids, targets, voter_positions))
+    allocation = allocation[targets != voter_positions]
+    allocation["Hate Points"] = allocation["Total Points Used"] - allocation["Points to Target"]
+    return allocation
+
+
+def hate_breakdown(facts, rounds, pairs):
+    """Round-by-round hate detail for each (Target ID, Voter ID) row in `pairs`.
+
+    Only rounds the voter took part in are listed; rounds where the target had no
+    songs count 0 hate points.
+    """
+    vote_facts, submission_facts = facts["votes"], facts["submissions"]
+    round_order = pd.Series(range(len(rounds)), index=rounds["ID"].astype(str))
+    pairs = pairs[["Target ID", "Voter ID"]].astype(str)
+
+    totals = vote_facts.groupby(["Voter ID", "Round ID"], observed=True)["Points Assigned"].sum().rename("Total Points")
+    given = (
+        vote_facts.groupby(["Voter ID", "Submitter ID", "Round ID"], observed=True)["Points Assigned"]
+        .sum()
+        .rename("Points to You")
+        .rename_axis(["Voter ID", "Target ID", "Round ID"])
+    )
+    had_songs = pd.MultiIndex.from_frame(submission_facts[["Submitter ID", "Round ID"]].drop_duplicates().astype(str))
+
+    breakdown = pairs.merge(totals.reset_index().astype({"Voter ID": str, "Round ID": str}), on="Voter ID")
+    breakdown = breakdown[breakdown["Round ID"].isin(round_order.index)]
+    breakdown = breakdown.merge(
+        given.reset_index().astype({"Voter ID": str, "Target ID": str, "Round ID": str}),
+        on=["Voter ID", "Target ID", "Round ID"],
+        how="left"
+    )
+    breakdown["Points to You"] = breakdown["Points to You"].fillna(0).astype("int64")
+    had = pd.MultiIndex.from_frame(breakdown[["Target ID", "Round ID"]]).isin(had_songs)
+    breakdown["Hate Points"] = (breakdown["Total Points"] - breakdown["Points to You"]).where(had, 0)
+    breakdown["Round"] = breakdown["Round ID"].map(facts["rounds"])
+    breakdown = breakdown.assign(order=breakdown["Round ID"].map(round_order)).sort_values(["Target ID", "Voter ID", "order"])
+    return breakdown[["Target ID", "Voter ID", "Round", "Total Points", "Points to You", "Hate Points"]].reset_index(drop=True)
+
+
+def _percent(points, available):
+    """`points` as a formatted share of `available` ("12.5%"), or "0%" where nothing was available."""
+    points, available = np.asarray(points, dtype=float), np.asarray(available, dtype=float)
+    share = np.divide(points, available, out=np.zeros_like(points), where=available > 0) * 100
+    return np.where(available > 0, np.char.mod("%.1f%%", share), "0%")
+
+
+def _by_player(df, key, column=None, ascending=True):
+    """`df` sorted by player ID (as strings), then `column`, and indexed by that ID, so one player's rows are a slice."""
+    df = df.assign(**{key: df[key].astype(str)})
+    if column is None:
+        return df.sort_values(key, kind="stable").set_index(key)
+    return df.sort_values([key, column], ascending=[True, ascending], kind="stable").set_index(key)
+
+
+def _rows(frame, player_id):
+    """One player's rows of a frame indexed by player ID first; empty if they have none."""
+    rows = frame.loc[player_id:player_id]
+    return rows.droplevel(0) if isinstance(rows.index, pd.MultiIndex) else rows
+
+
+def player_profiles(facts, hate, allocation, rounds, competitors):
+    """Everything the Player Profile tab shows, for every competitor, in one batched pass.
+
+    Tables are kept whole, sorted and indexed by player ID; `player_profile` slices one
+    player out of them, so switching players is a lookup.
+    """
+    subs = facts["submissions"].rename_axis("position").reset_index()
+    totals = subs.groupby("Submitter ID", observed=True)["Total Points"].agg(["sum", "mean"])
+
+    supporters = facts["pairs"].rename(columns={"Points": "Total Points Given"})
+    supporters["Voter"] = _decode(supporters["Voter ID"], facts["players"])
+    supporters = supporters.groupby(["Submitter ID", "Voter"], observed=True)["Total Points Given"].sum().reset_index()
+
+    haters = hate[hate["Hate Points"] >= 2].sort_values("Hate Points", ascending=False, kind="stable")
+    biggest_haters = haters.groupby(level="Target ID").head(1).index.to_frame(index=False)
+
+    players = {}
+    for player_id, name in zip(competitors["ID"].astype(str), competitors["Name"]):
+        if not pd.isna(name):
+            players.setdefault(name, player_id)
+
+    return {
+        "players": players,
+        "totals": totals,
+        "best": _by_player(subs, "Submitter ID", "Total Points", ascending=False).groupby(level=0).head(5),
+        "worst": _by_player(subs, "Submitter ID", "Total Points").groupby(level=0).head(5),
+        "history": _by_player(subs, "Submitter ID", "Round"),
+        "supporters": _by_player(supporters, "Submitter ID", "Total Points Given", ascending=False),
+        "breakdowns": _by_player(hate_breakdown(facts, rounds, biggest_haters), "Target ID"),
+        # Already grouped by target, in (Target ID, Voter ID) order
+        "hate": hate,
+        "allocation": allocation,
+    }
+
+
+def player_profile(profiles, name):
+    """One player's Player Profile tables, sliced out of `player_profiles`."""
+    player_id = profiles["players"][name]
+    totals = profiles["totals"]
+    song_columns = ["Title", "Primary Artist", "Total Points", "Round"]
+
+    hate = _rows(profiles["hate"], player_id)
+    haters = hate[hate["Hate Points"] >= 2].sort_values("Hate Points", ascending=False, kind="stable")
+    allocation = (
+        _rows(profiles["allocation"], player_id)
+        .sort_values("Points to Target", ascending=False, kind="stable")
+        .rename(columns={"Points to Target": "Points to You"})
+    )
+    # Shares are formatted only for the rows shown, not the season's n² pairs
+    allocation["Your Share %"] = _percent(allocation["Points to You"], allocation["Total Points Used"])
+    top_haters = haters.head(5)
+    top_haters = top_haters.assign(**{"Hate %": _percent(top_haters["Hate Points"], top_haters["Points Available"])})
+    history = _rows(profiles["history"], player_id).set_index("position").rename_axis(None)
+    return {
+        "id": player_id,
+        "has_songs": player_id in totals.index,
+        "total": int(totals["sum"].get(player_id, 0)),
+        "average": float(totals["mean"].get(player_id, float("nan"))),
+        "best": _rows(profiles["best"], player_id)[song_columns].reset_index(drop=True),
+        "worst": _rows(profiles["worst"], player_id)[song_columns].reset_index(drop=True),
+        "supporters": _rows(profiles["supporters"], player_id)[["Voter", "Total Points Given"]].reset_index(drop=True),
+        "hater_count": len(haters),
+        "haters": top_haters,
+        "biggest_hater": _rows(profiles["breakdowns"], player_id)[["Round", "Total Points", "Points to You", "Hate Points"]].reset_index(drop=True),
+        "allocation": allocation.reset_index(drop=True),
+        "history": history[["Round", "Title", "Primary Artist", "Total Points"]],
+    }
+
+
+def season_aggregates(facts, hate, competitors, season):
+    """Small per-season summaries that the All Seasons view combines.
+
+    Everything is keyed on player IDs, which stay the same across seasons.
+    """
+    submission_facts = facts["submissions"]
+
+    players = (
+        submission_facts.assign(**{"Zero Vote Songs": submission_facts["Total Points"].eq(0)})
+        .groupby("Submitter ID", observed=True)
+        .agg(**{
+            "Songs": ("Total Points", "size"),
+            "Total Points": ("Total Points", "sum"),
+            "Zero Vote Songs": ("Zero Vote Songs", "sum"),
+        })
+        .rename_axis("Player ID")
+        .reset_index()
+        .astype({"Player ID": str})
+    )
+    supporters = (
+        facts["pairs"]
+        .rename(columns={"Submitter ID": "Target ID", "Points": "Total Points Given"})
+        .astype({"Voter ID": str, "Target ID": str})
+    )
+    artists = submission_facts["Primary Artist"].value_counts().rename("Submissions").rename_axis("Artist").reset_index()
+    names = pd.DataFrame({"Player ID": competitors["ID"].astype(str), "Name": competitors["Name"]})
+
+    return {
+        name: df.assign(Season=season)
+        for name, df in {
+            "players": players,
+            "supporters": supporters,
+            "haters": hate[["Hate Points", "Points Available", "Points Given to You"]].reset_index(),
+            "artists": artists[artists["Submissions"] > 0],
+            "names": names,
+        }.items()
+    }
+
+
+def career_aggregates(aggregates, min_submissions=2, top_artist_count=15):
+    """Combine `season_aggregates` from any number of seasons into career tables."""
+    combined = {name: pd.concat([season[name] for season in aggregates], ignore_index=True) for name in aggregates[0]}
+    # A player's most recent name wins
+    names = combined["names"].sort_values("Season").drop_duplicates("Player ID", keep="last").set_index("Player ID")["Name"]
+
+    players = combined["players"].groupby("Player ID").agg(**{
+        "Seasons": ("Season", "nunique"),
+        "Songs": ("Songs", "sum"),
+        "Total Points": ("Total Points", "sum"),
+        "Zero Vote Songs": ("Zero Vote Songs", "sum"),
+    })
+    players.insert(0, "Username", players.index.map(names))
+
+    board = players[["Username", "Seasons", "Songs", "Total Points"]].copy()
+    board["Points per Song"] = (board["Total Points"] / board["Songs"]).round(2)
+    board = board.sort_values("Total Points", ascending=False, kind="stable").reset_index(drop=True)
+
+    snubs = players[(players["Zero Vote Songs"] > 0) & (players["Songs"] >= min_submissions)].copy()
+    snubs["Snub Rate (%)"] = (snubs["Zero Vote Songs"] / snubs["Songs"] * 100).round(1)
+    snubs = snubs.sort_values("Snub Rate (%)", ascending=False, kind="stable").reset_index(drop=True)
+    snubs.insert(0, "Rank", range(1, len(snubs) + 1))
+    snubs = snubs[["Rank", "Username", "Seasons", "Zero Vote Songs", "Songs", "Snub Rate (%)"]].rename(
+        columns={"Songs": "Total Submissions"}
+    )
+
+    supporters = combined["supporters"].groupby(["Target ID", "Voter ID"])["Total Points Given"].sum().reset_index()
+    supporters["Voter"] = supporters["Voter ID"].map(names)
+    supporters = supporters.sort_values("Total Points Given", ascending=False, kind="stable")
+
+    haters = combined["haters"].groupby(["Target ID", "Voter ID"]).agg(**{
+        "Seasons": ("Season", "nunique"),
+        "Hate Points": ("Hate Points", "sum"),
+        "Points Available": ("Points Available", "sum"),
+        "Points Given to You": ("Points Given to You", "sum"),
+    }).reset_index()
+    haters.insert(2, "Hater", haters["Voter ID"].map(names))
+    haters["Hate %"] = (haters["Hate Points"] / haters["Points Available"].where(haters["Points Available"] > 0) * 100).round(1).fillna(0)
+    haters = haters.sort_values("Hate Points", ascending=False, kind="stable")
+
+    artist_totals = combined["artists"].groupby("Artist")["Submissions"].sum().sort_values(ascending=False, kind="stable")
+    top = artist_totals.head(top_artist_count).index
+    artists = combined["artists"][combined["artists"]["Artist"].isin(top)].astype({"Artist": str})
+
+    return {
+        "names": names,
+        "leaderboard": board,
+        "snubs": snubs,
+        "supporters": supporters,
+        "haters": haters,
+        "artists": artists.sort_values(["Season", "Submissions"], ascending=[True, False]).reset_index(drop=True),
+    }
@@ -0,0 +1,195 @@
+"""Time every dashboard section on real or synthetic seasons.
+
+    python benchmark.py exports/season_3                           # a real export
+    python benchmark.py --players 1000 --rounds 200 --votes 1000000   # synthetic league
+
+Each run appends one JSON line to --output (default benchmarks/results.jsonl) with the
+git commit, dataset size and per-section timings, so regressions show up across versions.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import plotly.express as px
+
+from analytics import (
+    allocation_matrix,
+    build_facts,
+    explore_index,
+    explore_page,
+    explore_search,
+    hate_matrix,
+    heatmap_matrix,
+    heatmap_points,
+    lead_changes,
+    leaderboard,
+    most_similar_voters,
+    player_profile,
+    player_profiles,
+    round_participation,
+    round_points,
+    season_metrics,
+    snub_rates,
+    standings,
+    standings_chart_data,
+    top_artists,
+    top_songs,
+    vote_vectors,
+    voter_similarity,
+    voting_blocs,
+)
+from generate_league import generate_league, write_league
+from loader import load_season
+from profiling import git_commit
+
+HEATMAP_MAX_SIZE = 60  # main.HEATMAP_MAX_SIZE; importing main would start the Streamlit app
+
+
+def _load(state):
+    state["data"] = load_season(state["path"])
+
+
+def _facts(state):
+    state["facts"] = build_facts(**state["data"])
+
+
+def _participation(state):
+    round_participation(state["data"]["submissions"], state["data"]["rounds"])
+
+
+def _leaderboard(state):
+    leaderboard(state["facts"])
+
+
+def _standings(state):
+    table = standings(round_points(state["facts"], state["data"]["rounds"]))
+    lead_changes(table)
+    chart = standings_chart_data(table, 10, 40)
+    px.bar(chart, x="Cumulative Points", y="Username", orientation="h", animation_frame="Round Number").to_json()
+
+
+def _metrics(state):
+    submissions = state["data"]["submissions"]
+    season_metrics(state["facts"], state["data"]["competitors"])
+    px.bar(top_artists(submissions), x="Submission Count", y="Artist", orientation="h").to_json()
+    px.bar(top_songs(submissions), x="Submission Count", y="Title", orientation="h").to_json()
+
+
+def _heatmap(order):
+    """The dashboard's heatmap: sparse points, tiled matrix, figure JSON."""
+    def section(state):
+        pivot = heatmap_matrix(heatmap_points(state["facts"]), order, None, [], HEATMAP_MAX_SIZE)
+        fig = px.imshow(pivot, labels=dict(x="Submitter", y="Voter", color="Points"), color_continuous_scale="viridis")
+        fig.update_layout(height=600, xaxis_tickangle=-45)
+        fig.to_json()
+    return section
+
+
+def _snubs(state):
+    snub_rates(state["facts"])
+
+
+def _explore(state):
+    index = explore_index(state["facts"])
+    table = index["table"]
+    user, round_name = table["Username"].dropna().iloc[0], table["Round Name"].dropna().iloc[0]
+    explore_page(index, explore_search(index, user, round_name), 1, 50)
+    explore_page(index, explore_search(index, text=table["Song Name"].iloc[0]), 1, 50)
+
+
+def _blocs(state):
+    facts = state["facts"]
+    similarity = voter_similarity(vote_vectors(facts), len(facts["submissions"]))
+    voting_blocs(similarity)
+    most_similar_voters(similarity)
+
+
+def _profile(state):
+    data, facts = state["data"], state["facts"]
+    hate = hate_matrix(facts, data["rounds"], data["competitors"])
+    allocation = allocation_matrix(facts, data["competitors"])
+    profiles = player_profiles(facts, hate, allocation, data["rounds"], data["competitors"])
+    player_profile(profiles, next(iter(profiles["players"])))
+
+
+# Run in order; later sections reuse what earlier ones put in `state`
+SECTIONS = {
+    "load": _load,
+    "facts": _facts,
+    "participation": _participation,
+    "leaderboard": _leaderboard,
+    "standings": _standings,
+    "metrics": _metrics,
+    "heatmap": _heatmap("name"),
+    "heatmap_cluster": _heatmap("cluster"),
+    "snubs": _snubs,
+    "explore": _explore,
+    "profile": _profile,
+    "blocs": _blocs,
+}
+
+
+def benchmark_season(path, repeat=3, sections=None):
+    """{section: {"median_s", "min_s", "runs"}} for one season directory."""
+    timings = {name: [] for name in SECTIONS}
+    for _ in range(repeat):
+        state = {"path": path}
+        for name, section in SECTIONS.items():
+            start = time.perf_counter()
+            section(state)
+            timings[name].append(time.perf_counter() - start)
+    return {
+        name: {"median_s": statistics.median(runs), "min_s": min(runs), "runs": runs}
+        for name, runs in timings.items()
+        if sections is None or name in sections
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="season directories to benchmark (default: a synthetic league)")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--votes", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default="benchmarks/data", help="where synthetic leagues are written and reused")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sections", nargs="*", choices=list(SECTIONS), help="only report these sections")
+    parser.add_argument("--output", default="benchmarks/results.jsonl")
+    args = parser.parse_args()
+
+    paths = args.paths
+    if not paths:
+        path = os.path.join(args.data_dir, f"p{args.players}_r{args.rounds}_v{args.votes}_s{args.seed}")
+        if not os.path.exists(os.path.join(path, "votes.csv")):
+            print(f"Generating synthetic league in {path}")
+            write_league(path, generate_league(args.players, args.rounds, args.votes, seed=args.seed))
+        paths = [path]
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    for path in paths:
+        data = load_season(path)
+        result = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "dataset": {"path": path, **{name: len(df) for name, df in data.items()}},
+            "repeat": args.repeat,
+            "sections": benchmark_season(path, args.repeat, args.sections),
+        }
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+
+        print(f"{path} ({', '.join(f'{len(df)} {name}' for name, df in data.items())})")
+        for name, timing in result["sections"].items():
+            print(f"  {name:<14} {timing['median_s'] * 1000:10.1f} ms (min {timing['min_s'] * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Write a synthetic season in the Music League export format.
+
+    python generate_league.py benchmarks/data/large --players 1000 --rounds 200 --votes 1000000
+
+Produces competitors.csv, rounds.csv, submissions.csv and votes.csv that load with
+loader.load_season. Artists and songs are drawn from a Zipf-like catalog so some
+songs get resubmitted across rounds, like real leagues.
+"""
+import argparse
+import os
+import string
+
+import numpy as np
+import pandas as pd
+
+BASE62 = np.array(list(string.digits + string.ascii_letters))
+
+
+def _hex_ids(rng, n):
+    return ["".join(row) for row in rng.choice(list("0123456789abcdef"), size=(n, 32))]
+
+
+def _track_uris(rng, n):
+    return ["spotify:track:" + "".join(row) for row in rng.choice(BASE62, size=(n, 22))]
+
+
+def _timestamps(values):
+    return pd.Series(values).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def generate_league(players=50, rounds=20, votes=5000, participation=0.85, catalog_size=None, seed=0):
+    """Build the four export frames for a synthetic season."""
+    rng = np.random.default_rng(seed)
+    catalog_size = catalog_size or max(100, players * 2, players * rounds // 2)
+
+    competitor_ids = np.array(_hex_ids(rng, players))
+    competitors = pd.DataFrame({"ID": competitor_ids, "Name": [f"Player {i + 1}" for i in range(players)]})
+
+    round_ids = np.array(_hex_ids(rng, rounds))
+    round_created = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rounds) * 7, unit="D")
+    rounds_df = pd.DataFrame({
+        "ID": round_ids,
+        "Created": _timestamps(round_created),
+        "Name": [f"Round {i + 1}" for i in range(rounds)],
+        "Description": [f"Theme number {i + 1}" for i in range(rounds)],
+        "Playlist URL": [f"https://open.spotify.com/playlist/{uri[14:]}" for uri in _track_uris(rng, rounds)],
+    })
+
+    # Song catalog with a heavy-tailed popularity so resubmissions happen
+    artists = np.array([f"Artist {i + 1}" for i in range(max(10, catalog_size // 5))])
+    catalog = pd.DataFrame({
+        "Spotify URI": _track_uris(rng, catalog_size),
+        "Title": [f"Song {i + 1}" for i in range(catalog_size)],
+        "Album": [f"Album {i // 10 + 1}" for i in range(catalog_size)],
+        "Artist(s)": artists[np.minimum(rng.zipf(1.3, catalog_size) - 1, len(artists) - 1)],
+    })
+    popularity = 1.0 / np.arange(1, catalog_size + 1) ** 0.8
+    popularity /= popularity.sum()
+
+    submission_frames, vote_frames = [], []
+    votes_per_voter = max(1, round(votes / max(1, rounds * players * participation)))
+    for round_id, created in zip(round_ids, round_created):
+        submitters = np.flatnonzero(rng.random(players) < participation)
+        if len(submitters) < 2:
+            submitters = rng.choice(players, size=min(2, players), replace=False)
+        n = len(submitters)
+        songs = rng.choice(catalog_size, size=n, replace=False, p=popularity)
+        submitted_at = created + pd.to_timedelta(rng.integers(0, 3 * 86400, n), unit="s")
+        submission_frames.append(pd.DataFrame({
+            "Spotify URI": catalog["Spotify URI"].to_numpy()[songs],
+            "Title": catalog["Title"].to_numpy()[songs],
+            "Album": catalog["Album"].to_numpy()[songs],
+            "Artist(s)": catalog["Artist(s)"].to_numpy()[songs],
+            "Submitter ID": competitor_ids[submitters],
+            "Created": _timestamps(submitted_at),
+            "Comment": np.where(rng.random(n) < 0.3, "banger", ""),
+            "Round ID": round_id,
+            "Visible To Voters": "Yes",
+        }).sort_values("Created", kind="stable"))
+
+        # Every submitter votes on k other songs in the round, never their own
+        k = min(votes_per_voter, n - 1)
+        scores = rng.random((n, n))
+        np.fill_diagonal(scores, -1)
+        picks = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        points = rng.choice([-1, 1, 1, 2, 2, 3, 4, 5], size=(n, k))
+        voted_at = created + pd.to_timedelta(3 * 86400 + rng.integers(0, 2 * 86400, n), unit="s")
+        # Written in the order votes were cast, like a real export, so partial re-exports are pure appends
+        vote_frames.append(pd.DataFrame({
+            "Spotify URI": catalog["Spotify URI"].to_numpy()[songs[picks.ravel()]],
+            "Voter ID": np.repeat(competitor_ids[submitters], k),
+            "Created": np.repeat(_timestamps(voted_at).to_numpy(), k),
+            "Points Assigned": points.ravel(),
+            "Comment": "",
+            "Round ID": round_id,
+        }).sort_values("Created", kind="stable"))
+
+    return {
+        "votes": pd.concat(vote_frames, ignore_index=True),
+        "submissions": pd.concat(submission_frames, ignore_index=True),
+        "rounds": rounds_df,
+        "competitors": competitors,
+    }
+
+
+def write_league(path, league):
+    os.makedirs(path, exist_ok=True)
+    for name, df in league.items():
+        df.to_csv(os.path.join(path, f"{name}.csv"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="directory to write the season CSVs to")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--votes", type=int, default=5000, help="approximate total number of votes")
+    parser.add_argument("--participation", type=float, default=0.85, help="chance a player enters a given round")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    league = generate_league(args.players, args.rounds, args.votes, args.participation, seed=args.seed)
+    write_league(args.path, league)
+    print(", ".join(f"{len(df)} {name}" for name, df in league.items()) + f" written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
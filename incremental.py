@@ -0,0 +1,38 @@
+"""Keep a live season current by parsing and applying only the rows appended to its export.
+
+A season is reloaded from scratch only when rows that were already read change.
+"""
+from analytics import build_facts, extend_facts
+from loader import append_season, load_marked_season, read_appended, season_signature
+
+
+def load_state(path):
+    signature = season_signature(path)
+    data, marks = load_marked_season(path)
+    return {"signature": signature, "marks": marks, "data": data, "facts": build_facts(**data), "update": "full"}
+
+
+def refresh_state(state, path):
+    """A new state for the files now on disk. `state` itself is never modified, so readers can keep using it.
+
+    A state built from appended rows records the signature it was built on and the changes applied.
+    """
+    signature = season_signature(path)
+    appended = read_appended(path, state["data"], state["marks"])
+    if appended is not None:
+        delta, marks = appended
+        data = append_season(state["data"], delta)
+        extended = extend_facts(state["facts"], data, delta)
+        if extended is not None:
+            facts, changes = extended
+            return {
+                "signature": signature,
+                "marks": marks,
+                "data": data,
+                "facts": facts,
+                "update": "appended",
+                # What tables built for `previous` need to catch up (see analytics.extend_facts)
+                "previous": state["signature"],
+                "changes": changes,
+            }
+    return load_state(path)
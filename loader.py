@@ -0,0 +1,213 @@
+import io
+import os
+import zlib
+
+import pandas as pd
+
+SEASON_FILES = ("votes", "submissions", "rounds", "competitors")
+
+# Explicit dtypes so pandas doesn't have to infer them on every load.
+# IDs, URIs and artists repeat heavily, so categoricals keep them small and cheap to group on.
+# Round and competitor names are unique within their own table and are only used as lookup values.
+SEASON_DTYPES = {
+    "votes": {
+        "Spotify URI": "category",
+        "Voter ID": "category",
+        "Points Assigned": "int8",
+        "Comment": "string",
+        "Round ID": "category",
+    },
+    "submissions": {
+        "Spotify URI": "category",
+        "Title": "string",
+        "Album": "string",
+        "Artist(s)": "string",
+        "Submitter ID": "category",
+        "Comment": "string",
+        "Round ID": "category",
+        "Visible To Voters": "category",
+    },
+    "rounds": {
+        "ID": "category",
+        "Name": "string",
+        "Description": "string",
+        "Playlist URL": "string",
+    },
+    "competitors": {
+        "ID": "category",
+        "Name": "string",
+    },
+}
+
+SEASON_DATES = {
+    "votes": ["Created"],
+    "submissions": ["Created"],
+    "rounds": ["Created"],
+    "competitors": [],
+}
+
+# Columns that are joined against each other share one category set, so merges and
+# groupbys across frames stay categorical instead of falling back to strings.
+SHARED_CATEGORIES = {
+    "Spotify URI": [("votes", "Spotify URI"), ("submissions", "Spotify URI")],
+    "Round ID": [("votes", "Round ID"), ("submissions", "Round ID"), ("rounds", "ID")],
+    "Competitor ID": [("votes", "Voter ID"), ("submissions", "Submitter ID"), ("competitors", "ID")],
+}
+
+
+EXPORTS_ENV = "MUSIC_LEAGUE_EXPORTS"
+
+
+def exports_root():
+    """Directory holding the season_N exports: $MUSIC_LEAGUE_EXPORTS, or exports/."""
+    return os.environ.get(EXPORTS_ENV) or "exports"
+
+
+def find_seasons(root):
+    """{season number: path} for every `season_N` directory under `root`, in season order."""
+    seasons = {}
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith("season_") and os.path.isdir(path):
+            seasons[int(name.split("_")[1])] = path
+    return dict(sorted(seasons.items()))
+
+
+def season_files(path):
+    return {name: os.path.join(path, f"{name}.csv") for name in SEASON_FILES}
+
+
+def season_signature(path):
+    """(file, mtime, size) for every CSV in a season, so a fresh export changes the cache key."""
+    signature = []
+    for name, file_path in season_files(path).items():
+        stat = os.stat(file_path)
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def read_season_csv(path, name, source=None):
+    """One season CSV with explicit dtypes; `source` overrides the file (e.g. a buffer holding just new rows)."""
+    df = pd.read_csv(
+        source if source is not None else os.path.join(path, f"{name}.csv"),
+        dtype=SEASON_DTYPES[name],
+        parse_dates=SEASON_DATES[name],
+    )
+    if name == "submissions":
+        df["Primary Artist"] = (
+            df["Artist(s)"].fillna("nan").str.split(",").str[0].str.strip().astype("category")
+        )
+    return df
+
+
+def recode(series, dtype):
+    """`series` on `dtype`'s categories in their exact order.
+
+    `astype` skips unordered categoricals whose sets match in a different order,
+    which would leave codes that disagree between frames.
+    """
+    if series.cat.categories.equals(dtype.categories):
+        return series
+    return series.cat.set_categories(dtype.categories)
+
+
+def unify_categories(data, *others):
+    """Give every shared key one sorted category set, across `data` and any `others` (e.g. appended rows)."""
+    datasets = (data, *others)
+    for columns in SHARED_CATEGORIES.values():
+        categories = set()
+        for dataset in datasets:
+            for name, column in columns:
+                categories.update(dataset[name][column].cat.categories)
+        dtype = pd.CategoricalDtype(sorted(categories))
+        for dataset in datasets:
+            for name, column in columns:
+                dataset[name][column] = recode(dataset[name][column], dtype)
+    return data
+
+
+def load_season(path):
+    return unify_categories({name: read_season_csv(path, name) for name in SEASON_FILES})
+
+
+def load_marked_season(path):
+    """(data, marks) like `load_season`, plus {name: (size, crc32)} of the exact bytes parsed.
+
+    The marks let `read_appended` tell rows appended later from rewritten ones.
+    """
+    data, marks = {}, {}
+    for name, file_path in season_files(path).items():
+        with open(file_path, "rb") as f:
+            content = f.read()
+        marks[name] = (len(content), zlib.crc32(content))
+        data[name] = read_season_csv(path, name, io.BytesIO(content))
+    return unify_categories(data), marks
+
+
+def _appended_rows(file_path, mark):
+    """Bytes added after `mark` (header included), or None if anything before it changed."""
+    size, crc = mark
+    with open(file_path, "rb") as f:
+        content = f.read()
+    if len(content) < size or zlib.crc32(content[:size]) != crc:
+        return None
+    if size and not content[:size].endswith(b"\n") and not content[size:].startswith((b"\n", b"\r")):
+        return None
+    header = content[:content.index(b"\n") + 1]
+    return header + content[size:], (len(content), zlib.crc32(content))
+
+
+def _is_append(data, delta):
+    """True when the new rows only extend the season: later votes, newer rounds and new players."""
+    votes, submissions, rounds, competitors = (delta[name] for name in SEASON_FILES)
+    if len(votes) and len(data["votes"]) and votes["Created"].min() < data["votes"]["Created"].max():
+        return False
+    if len(submissions) and len(data["submissions"]):
+        last_round = data["submissions"]["Round ID"].iloc[-1]
+        earlier_rounds = set(data["submissions"]["Round ID"].unique()) - {last_round}
+        if submissions["Round ID"].isin(earlier_rounds).any():
+            return False
+    if rounds["ID"].isin(data["rounds"]["ID"]).any() or competitors["ID"].isin(data["competitors"]["ID"]).any():
+        return False
+    return True
+
+
+def read_appended(path, data, marks):
+    """(appended rows, new marks) when every CSV only grew past `marks`, else None.
+
+    Only the new bytes are parsed. None means historical rows changed (or the new rows
+    go back in time) and the season has to be reloaded from scratch.
+    """
+    delta, new_marks = {}, {}
+    for name, file_path in season_files(path).items():
+        appended = _appended_rows(file_path, marks[name])
+        if appended is None:
+            return None
+        rows, new_marks[name] = appended
+        try:
+            delta[name] = read_season_csv(path, name, io.BytesIO(rows))
+        except pd.errors.ParserError:
+            return None
+    if not _is_append(data, delta):
+        return None
+    return delta, new_marks
+
+
+def append_season(data, delta):
+    """`data` with `delta` appended; categoricals are recoded onto shared sorted sets, never rebuilt from strings.
+
+    `data` itself is left untouched since other sessions may still be reading it; `delta`
+    is recoded in place so it can be matched against the combined frames.
+    """
+    data = {name: df.copy(deep=False) for name, df in data.items()}
+    unify_categories(data, delta)
+    combined = {}
+    for name in SEASON_FILES:
+        old, new = data[name], delta[name]
+        for column in old.columns:
+            if isinstance(old[column].dtype, pd.CategoricalDtype) and not old[column].cat.categories.equals(new[column].cat.categories):
+                dtype = pd.CategoricalDtype(sorted(set(old[column].cat.categories) | set(new[column].cat.categories)))
+                old, new = old.assign(**{column: recode(old[column], dtype)}), new.assign(**{column: recode(new[column], dtype)})
+        combined[name] = pd.concat([old, new], ignore_index=True) if len(new) else old
+        delta[name] = new
+    return combined
@@ -0,0 +1,273 @@
+"""Simulate many viewers on one dashboard instance, headlessly, with Streamlit's AppTest.
+
+    python loadtest.py                                   # 10 sessions on exports/
+    python loadtest.py --sessions 40 --interactions 30 --think 2
+    python loadtest.py --players 300 --rounds 40 --votes 100000 --seasons 3   # synthetic league
+
+Every session opens the app and then switches seasons, flips tabs, picks profile players
+and applies Explore filters at random. All sessions share one process, so they share its
+caches like the viewers of one `streamlit run` instance. AppTest runs one script at a time
+per process, so reruns queue for the app the way a GIL-bound server does: "service" is how
+long a rerun took, "response" adds the time spent waiting for the other sessions.
+
+Reports throughput, latency percentiles per interaction and memory growth, and appends one
+JSON line to --output (default benchmarks/loadtest.jsonl).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+import streamlit
+from streamlit import config as streamlit_config
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+from generate_league import generate_league, write_league
+from loader import EXPORTS_ENV, exports_root
+from profiling import git_commit
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+SEASON_TABS = [
+    "📅 Rounds & Participation",
+    "🏆 Leaderboard",
+    "🥲 Snubs",
+    "🔍 Explore",
+    "🎧 Player Profile",
+    "📈 Metrics Summary",
+    "🤝 Voting Blocs",
+]
+CAREER_TABS = ["🏆 Career Leaderboard", "🥲 Career Snubs", "🤝 Supporters & Haters", "🎨 Artist Trends"]
+EXPLORE_FILTERS = ["Filter by Username", "Filter by Round", "Filter by Artist"]
+ACTIONS = ["season", "tab", "player", "explore"]
+
+
+def _rss_mb():
+    """Current resident memory of this process (peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _widget(widgets, label):
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+class Session:
+    """One simulated viewer: its own AppTest (widget and session state) and a random script."""
+
+    def __init__(self, app_lock, rng, timeout):
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.app_lock = app_lock
+        self.rng = rng
+        self.section = rng.choice(SEASON_TABS)
+        self.career_section = CAREER_TABS[0]
+        self.timings = []
+
+    def _run(self, action, change=None):
+        """Apply `change` to the widgets and rerun; records (action, service s, response s, errors)."""
+        queued = time.perf_counter()
+        with self.app_lock:
+            start = time.perf_counter()
+            # Tab selection is not kept between AppTest runs, so it is set before each one
+            self.app.session_state["section"] = self.section
+            self.app.session_state["career_section"] = self.career_section
+            if change:
+                change()
+            self.app.run()
+            end = time.perf_counter()
+        self.timings.append((action, end - start, end - queued, len(self.app.exception)))
+
+    def _season_select(self):
+        return _widget(self.app.selectbox, "Select a Season")
+
+    def _on_season(self):
+        """Make sure a single season (not All Seasons) is showing before season-only actions."""
+        select = self._season_select()
+        if select.value == "All Seasons":
+            index = self.rng.randrange(len(select.options) - 1)
+            self._run("season", lambda: select.select_index(index))
+
+    def _open(self, section):
+        if self.section != section:
+            self.section = section
+            self._run("tab")
+
+    def open(self):
+        self._run("open")
+
+    def step(self):
+        action = self.rng.choice(ACTIONS)
+        if action == "season":
+            select = self._season_select()
+            index = self.rng.randrange(len(select.options))
+            self._run("season", lambda: select.select_index(index))
+        elif action == "tab":
+            if self._season_select().value == "All Seasons":
+                self.career_section = self.rng.choice(CAREER_TABS)
+            else:
+                self.section = self.rng.choice(SEASON_TABS)
+            self._run("tab")
+        elif action == "player":
+            self._on_season()
+            self._open("🎧 Player Profile")
+            select = _widget(self.app.selectbox, "Select a player")
+            if select is not None and select.options:
+                index = self.rng.randrange(len(select.options))
+                self._run("player", lambda: select.select_index(index))
+        else:
+            self._on_season()
+            self._open("🔍 Explore")
+            if self.rng.random() < 0.25:
+                search = _widget(self.app.text_input, "Search titles, albums, artists and comments")
+                word = self.rng.choice(["love", "night", "song", "the", "a", ""])
+                if search is not None:
+                    self._run("explore", lambda: search.input(word))
+                return
+            select = _widget(self.app.selectbox, self.rng.choice(EXPLORE_FILTERS))
+            if select is not None and select.options:
+                index = self.rng.randrange(len(select.options))
+                self._run("explore", lambda: select.select_index(index))
+
+
+def _percentiles(values):
+    values = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 1),
+        "p90_ms": round(float(np.percentile(values, 90)), 1),
+        "p99_ms": round(float(np.percentile(values, 99)), 1),
+        "max_ms": round(float(values.max()), 1),
+    }
+
+
+def run_load_test(sessions=10, interactions=20, think=0.0, seed=0, timeout=120):
+    """Drive `sessions` concurrent viewers through `interactions` random steps each; returns the summary dict."""
+    app_lock = threading.Lock()
+    start_rss = _rss_mb()
+    memory = [(0, start_rss)]
+    memory_lock = threading.Lock()
+    users = [Session(app_lock, random.Random(seed + i), timeout) for i in range(sessions)]
+
+    def viewer(user):
+        user.open()
+        for _ in range(interactions):
+            if think:
+                time.sleep(user.rng.expovariate(1 / think))
+            user.step()
+            with memory_lock:
+                memory.append((sum(len(u.timings) for u in users), _rss_mb()))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=viewer, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    timings = [timing for user in users for timing in user.timings]
+    by_action = defaultdict(list)
+    for action, service, response, _ in timings:
+        by_action[action].append((service, response))
+    # Growth over the second half of the run, after every season has been loaded once
+    done, rss = np.array(memory).T
+    late = done >= done.max() / 2
+    slope = np.polyfit(done[late], rss[late], 1)[0] if late.sum() > 2 and np.ptp(done[late]) else 0.0
+    return {
+        "sessions": sessions,
+        "interactions": len(timings),
+        "think_s": think,
+        "wall_s": round(wall, 2),
+        "throughput_per_s": round(len(timings) / wall, 2),
+        "errors": sum(errors for *_, errors in timings),
+        "service": _percentiles([service for _, service, _, _ in timings]),
+        "response": _percentiles([response for _, _, response, _ in timings]),
+        "actions": {
+            action: {
+                "service": _percentiles([service for service, _ in values]),
+                "response": _percentiles([response for _, response in values]),
+            }
+            for action, values in sorted(by_action.items())
+        },
+        "memory": {
+            "start_mb": round(start_rss, 1),
+            "end_mb": round(float(rss[-1]), 1),
+            "peak_mb": round(float(rss.max()), 1),
+            "late_growth_mb_per_100": round(float(slope) * 100, 2),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exports", help="directory with season_N exports (default: $MUSIC_LEAGUE_EXPORTS or exports/)")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated viewers")
+    parser.add_argument("--interactions", type=int, default=20, help="random steps per session after opening the app")
+    parser.add_argument("--think", type=float, default=0.0, help="mean seconds between a viewer's steps (0 = back to back)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds one rerun may take")
+    parser.add_argument("--players", type=int, help="generate a synthetic league of this many players instead")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--votes", type=int, default=20000)
+    parser.add_argument("--seasons", type=int, default=3, help="synthetic seasons to generate")
+    parser.add_argument("--data-dir", default="benchmarks/data", help="where synthetic leagues are written and reused")
+    parser.add_argument("--output", default="benchmarks/loadtest.jsonl")
+    args = parser.parse_args()
+
+    exports = args.exports or exports_root()
+    if args.players:
+        exports = os.path.join(args.data_dir, f"league_p{args.players}_r{args.rounds}_v{args.votes}_x{args.seasons}")
+        for season in range(1, args.seasons + 1):
+            path = os.path.join(exports, f"season_{season}")
+            if not os.path.exists(os.path.join(path, "votes.csv")):
+                print(f"Generating synthetic season in {path}")
+                write_league(path, generate_league(args.players, args.rounds, args.votes, seed=args.seed + season))
+    os.environ[EXPORTS_ENV] = exports
+    # Bare-mode warnings from every rerun would bury the report
+    streamlit_config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    summary = run_load_test(args.sessions, args.interactions, args.think, args.seed, args.timeout)
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "exports": exports,
+        **summary,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result) + "\n")
+
+    print(
+        f"{exports}: {summary['sessions']} sessions, {summary['interactions']} interactions in {summary['wall_s']} s "
+        f"({summary['throughput_per_s']}/s), {summary['errors']} errors"
+    )
+    print(f"  {'interaction':<12} {'count':>6} {'service p50/p90/p99 ms':>26} {'response p50/p90/p99 ms':>27}")
+    for action, stats in [("all", summary), *summary["actions"].items()]:
+        service, response = stats["service"], stats["response"]
+        print(
+            f"  {action:<12} {service['count']:>6} "
+            f"{service['p50_ms']:>8.0f} {service['p90_ms']:>8.0f} {service['p99_ms']:>8.0f} "
+            f"{response['p50_ms']:>8.0f} {response['p90_ms']:>8.0f} {response['p99_ms']:>9.0f}"
+        )
+    memory = summary["memory"]
+    print(
+        f"  memory: {memory['start_mb']} -> {memory['end_mb']} MB (peak {memory['peak_mb']} MB), "
+        f"{memory['late_growth_mb_per_100']} MB per 100 interactions over the second half"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,48 @@
-import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 
-import pandas as pd
 import plotly.express as px
+import plotly.io as pio
 import streamlit as st
 
+import store
+from analytics import (
+    allocation_matrix,
+    bloc_matrix,
+    career_aggregates,
+    explore_index,
+    explore_page,
+    explore_search,
+    extend_heatmap_points,
+    extend_leaderboard,
+    extend_snub_counts,
+    hate_matrix,
+    heatmap_matrix,
+    heatmap_points,
+    lead_changes,
+    leaderboard,
+    most_similar_voters,
+    player_profile,
+    player_profiles,
+    round_participation,
+    round_points,
+    season_aggregates,
+    season_metrics,
+    snub_counts,
+    snub_ranking,
+    standings,
+    standings_chart_data,
+    top_artists,
+    top_songs,
+    vote_vectors,
+    voter_similarity,
+    voting_blocs,
+)
+from loader import exports_root, find_seasons, season_signature
+from profiling import StageTimer, memory_tracing_enabled, profiling_enabled
+from season_cache import SeasonCache
+
 COLOR_PALETTE = [
     "#9e01c4",  # purple
     "#ff69b4",  # pink
@@ -16,18 +54,33 @@ COLOR_PALETTE = [
     "#f50057",  # hot pink
 ]
 
+ALL_SEASONS = "All Seasons"
+# Heatmap axes longer than this are averaged into tiles
+HEATMAP_MAX_SIZE = 60
+EXPLORE_PAGE_SIZE = 50
+# Standings charts sample at most this many rounds, so long seasons keep a small figure
+STANDINGS_MAX_ROUNDS = 40
+# Bound on cached figures and SQL results per function (option combinations add up)
+CACHE_ENTRIES = 256
+
 # --- Dynamic Season Setup ---
-season_dirs = [d for d in os.listdir("exports") if d.startswith("season_") and os.path.isdir(os.path.join("exports", d))]
-season_numbers = sorted([int(d.split("_")[1]) for d in season_dirs])
+# The directory scan is cached briefly so reruns don't hit the filesystem, but new exports still show up
+@st.cache_data(ttl=60, show_spinner=False)
+def list_seasons(root):
+    return find_seasons(root)
+
+season_paths = list_seasons(exports_root())
+season_numbers = list(season_paths)
 latest_season = season_numbers[-1] if season_numbers else 1
 
 SEASON_METADATA = {
     1: {"title": "🎶 Overwatch 3 Waiting Room 🎶"},
     2: {"title": "🎮 Marvel Rivals Waiting Room 🎮"},
     3: {"title": "💦 G00ning Corner 💦"},
+    ALL_SEASONS: {"title": "🏆 All Seasons 🏆"},
 }
-season_number = st.sidebar.selectbox("Select a Season", season_numbers, index=len(season_numbers) - 1)
-season_path = f"exports/season_{season_number}"
+season_number = st.sidebar.selectbox("Select a Season", season_numbers + [ALL_SEASONS], index=len(season_numbers) - 1)
+season_path = season_paths.get(season_number)
 meta = SEASON_METADATA.get(season_number, {"title": "🎵 Music League 🎵"})
 meta["color"] = random.choice(COLOR_PALETTE)
 
@@ -60,418 +113,528 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Load data
-def load_data(path):
-    return {
-        "votes": pd.read_csv(os.path.join(path, "votes.csv")),
-        "submissions": pd.read_csv(os.path.join(path, "submissions.csv")),
-        "rounds": pd.read_csv(os.path.join(path, "rounds.csv")),
-        "competitors": pd.read_csv(os.path.join(path, "competitors.csv"))
-    }
-
-data = load_data(season_path)
-votes, submissions, rounds, competitors = data.values()
-
-# --- Preprocess Data ---
-rounds["Created"] = pd.to_datetime(rounds["Created"]).dt.date
-
-# Tabs
-overview_tab, leaderboard_tab, snub_tab, explore_tab, profile_tab, metrics_tab = st.tabs([
-    "📅 Rounds & Participation",
-    "🏆 Leaderboard",
-    "🥲 Snubs",
-    "🔍 Explore",
-    "🎧 Player Profile",
-    "📈 Metrics Summary"
-])
-with overview_tab:
-    round_user_counts = (
-        submissions.groupby("Round ID")["Submitter ID"]
-        .nunique()
-        .reset_index()
-        .rename(columns={"Submitter ID": "Number of Participants"})
-    )
-    round_user_counts = round_user_counts.merge(
-        rounds[["ID", "Name", "Created"]],
-        left_on="Round ID",
-        right_on="ID",
-        how="left"
+# Season data and per-season tables are computed once and shared read-only by every session,
+# keeping a few recently used seasons (season_cache.py). A season still in progress only has
+# its appended rows applied when the export grows.
+@st.cache_resource(show_spinner=False)
+def shared_cache():
+    return SeasonCache()
+
+def load_data(path, signature):
+    return shared_cache().state(path, signature)["data"]
+
+def load_facts(path, signature):
+    return shared_cache().state(path, signature)["facts"]
+
+def season_artifact(path, signature, key, compute, update=None, stateless=False):
+    return shared_cache().artifact(path, signature, key, compute, update, stateless)
+
+def load_hate_matrix(path, signature):
+    def compute():
+        data = load_data(path, signature)
+        return hate_matrix(load_facts(path, signature), data["rounds"], data["competitors"])
+    return season_artifact(path, signature, "hate matrix", compute)
+
+def load_allocation_matrix(path, signature):
+    return season_artifact(path, signature, "allocation matrix", lambda: allocation_matrix(
+        load_facts(path, signature), load_data(path, signature)["competitors"]
+    ))
+
+def load_player_profiles(path, signature):
+    def compute():
+        data = load_data(path, signature)
+        return player_profiles(
+            load_facts(path, signature),
+            load_hate_matrix(path, signature),
+            load_allocation_matrix(path, signature),
+            data["rounds"],
+            data["competitors"]
+        )
+    return season_artifact(path, signature, "player profiles", compute)
+
+# Username/round/artist lookups and a token index
+def load_explore_index(path, signature):
+    return season_artifact(path, signature, "explore index", lambda: explore_index(load_facts(path, signature)))
+
+# Leaderboard, snub counts and heatmap points catch up from appended rows (see incremental.py)
+def load_leaderboard(path, signature):
+    return season_artifact(
+        path, signature, "leaderboard", lambda: leaderboard(load_facts(path, signature)),
+        lambda board, state: extend_leaderboard(board, state["changes"])
     )
-    round_user_counts = round_user_counts[["Name", "Created", "Number of Participants"]]
-    round_user_counts = round_user_counts.rename(columns={"Name": "Round Name", "Created": "Created At"})
-    round_user_counts = round_user_counts.sort_values("Created At")
-    st.dataframe(round_user_counts, use_container_width=True)
 
-with leaderboard_tab:
-    st.subheader("Top Players by Points")
-    votes_with_submitter = votes.merge(submissions[["Spotify URI", "Submitter ID", "Round ID"]], on=["Spotify URI", "Round ID"])
-    votes_with_submitter = votes_with_submitter.merge(competitors, left_on="Submitter ID", right_on="ID")
-    player_leaderboard = votes_with_submitter.groupby("Name")["Points Assigned"].sum().reset_index()
-    player_leaderboard.columns = ["Username", "Total Points"]
-    player_leaderboard = player_leaderboard.sort_values(by="Total Points", ascending=False)
-    st.dataframe(player_leaderboard, use_container_width=True)
-
-with metrics_tab:
-    st.header("📈 Season Summary Metrics")
-    total_votes = votes.shape[0]
-    total_songs = submissions.shape[0]
-    total_players = competitors.shape[0]
-    avg_votes_per_song = votes.groupby("Spotify URI")["Points Assigned"].sum().mean()
-    avg_points_per_user = votes.merge(submissions, on=["Spotify URI", "Round ID"], how="left")
-    avg_points_per_user = avg_points_per_user.groupby("Submitter ID")["Points Assigned"].sum().mean()
-
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Total Songs Submitted", total_songs)
-        st.metric("Total Votes Cast", total_votes)
-        st.metric("Average Votes per Song", f"{avg_votes_per_song:.2f}")
-    with col2:
-        st.metric("Total Players", total_players)
-        st.metric("Average Points per Player", f"{avg_points_per_user:.2f}")
-
-    st.subheader("🎨 Most Submitted Artists")
-    submissions["Primary Artist"] = submissions["Artist(s)"].apply(lambda x: str(x).split(",")[0].strip())
-    top_artists = submissions["Primary Artist"].value_counts().reset_index()
-    top_artists.columns = ["Artist", "Submission Count"]
-    fig_artist = px.bar(top_artists.head(10), x="Submission Count", y="Artist", orientation="h")
-    st.plotly_chart(fig_artist)
-
-    st.subheader("🎵 Most Submitted Songs")
-    top_songs = submissions.groupby(["Title", "Primary Artist"]).size().reset_index(name="Submission Count")
-    top_songs = top_songs[top_songs["Submission Count"] > 1].sort_values(by="Submission Count", ascending=False)
-    fig_songs = px.bar(top_songs.head(10), x="Submission Count", y="Title", orientation="h", hover_data={"Primary Artist": True, "Title": False})
-    st.plotly_chart(fig_songs)
-
-    st.subheader("🔥 Voting Heatmap")
-
-    # Merge votes with voter and submitter names
-    heatmap_df = votes.merge(
-        submissions[["Spotify URI", "Round ID", "Submitter ID"]],
-        on=["Spotify URI", "Round ID"],
-        how="left"
-    )
-    heatmap_df = heatmap_df.merge(
-        competitors[["ID", "Name"]].rename(columns={"ID": "Submitter ID", "Name": "Submitter Name"}),
-        on="Submitter ID",
-        how="left"
-    )
-    heatmap_df = heatmap_df.merge(
-        competitors[["ID", "Name"]].rename(columns={"ID": "Voter ID", "Name": "Voter Name"}),
-        on="Voter ID",
-        how="left"
+def load_snub_rates(path, signature):
+    counts = season_artifact(
+        path, signature, "snub counts", lambda: snub_counts(load_facts(path, signature)),
+        lambda counts, state: extend_snub_counts(counts, state["changes"])
     )
+    return snub_ranking(counts)
+
+def load_season_metrics(path, signature):
+    return season_artifact(path, signature, "season metrics", lambda: season_metrics(
+        load_facts(path, signature), load_data(path, signature)["competitors"]
+    ))
 
-    # Create pivot table: rows = Voters, columns = Submitters, values = total points given
-    pivot = heatmap_df.pivot_table(
-        index="Voter Name",
-        columns="Submitter Name",
-        values="Points Assigned",
-        aggfunc="sum",
-        fill_value=0
+def load_heatmap_points(path, signature):
+    return season_artifact(
+        path, signature, "heatmap points", lambda: heatmap_points(load_facts(path, signature)),
+        lambda points, state: extend_heatmap_points(points, state["changes"], state["facts"]["players"])
     )
 
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def load_season_aggregates(path, signature, season):
+    data = load_data(path, signature)
+    return season_aggregates(load_facts(path, signature), load_hate_matrix(path, signature), data["competitors"], season)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def load_career(seasons):
+    # seasons: ((number, path, signature), ...). Per-season aggregates are cached on their own
+    # and loaded concurrently, so a new or re-exported season is the only one recomputed.
+    with ThreadPoolExecutor(max_workers=min(8, len(seasons))) as pool:
+        aggregates = list(pool.map(lambda season: load_season_aggregates(season[1], season[2], season[0]), seasons))
+    return career_aggregates(aggregates)
+
+# Optional SQLite backend (MUSIC_LEAGUE_DB): each export is ingested once per signature and
+# tabs query only the rows they show instead of holding the whole season in memory
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def ingest_season(db_path, path, signature):
+    with closing(store.connect(db_path)) as conn:
+        store.ingest_season(conn, path)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def query_store(db_path, path, signature, name, *args):
+    with closing(store.connect(db_path)) as conn:
+        return getattr(store, name)(conn, path, *args)
+
+db_path = store.database_path()
+
+# Serialized once per season and option set, so reruns only deserialize the figure
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def load_heatmap_figure(path, signature, db_path, order, top_n, players):
+    if db_path:
+        points = query_store(db_path, path, signature, "heatmap_points")
+    else:
+        points = load_heatmap_points(path, signature)
+    pivot = heatmap_matrix(points, order, top_n, list(players), HEATMAP_MAX_SIZE)
     fig = px.imshow(
         pivot,
         labels=dict(x="Submitter", y="Voter", color="Points"),
         color_continuous_scale="viridis"
     )
     fig.update_layout(height=600, xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
-
-with snub_tab:
-    round_map = rounds.set_index("ID")["Name"]
-    submitter_map = competitors.set_index("ID")["Name"]
-
-    snubbed = submissions.copy()
-    snubbed["Primary Artist"] = snubbed["Artist(s)"].apply(lambda x: str(x).split(",")[0].strip())
-    snubbed["Username"] = snubbed["Submitter ID"].map(submitter_map)
-    snubbed["Round"] = snubbed["Round ID"].map(round_map)
-
-    vote_counts = votes.groupby("Spotify URI")["Points Assigned"].sum().reset_index()
-    vote_counts.columns = ["Spotify URI", "Total Points"]
-    snubbed = snubbed.merge(vote_counts, on="Spotify URI", how="left").fillna({"Total Points": 0})
-    snubbed["Total Points"] = snubbed["Total Points"].astype(int)
-
-    snubbed_stats = snubbed[snubbed["Total Points"] == 0].groupby("Username").size().reset_index(name="Zero Vote Songs")
-    submission_counts = submissions["Submitter ID"].map(submitter_map).value_counts().reset_index()
-    submission_counts.columns = ["Username", "Total Submissions"]
-    snubbed_stats = snubbed_stats.merge(submission_counts, on="Username", how="left")
-    snubbed_stats["Snub Rate (%)"] = (snubbed_stats["Zero Vote Songs"] / snubbed_stats["Total Submissions"] * 100).round(1)
-    snubbed_stats = snubbed_stats.sort_values(by="Zero Vote Songs", ascending=False)
-
-    ranked_snubbers = snubbed_stats[snubbed_stats["Total Submissions"] >= 2].copy()
-    ranked_snubbers = ranked_snubbers.sort_values(by="Snub Rate (%)", ascending=False).reset_index(drop=True)
-    ranked_snubbers.insert(0, "Rank", range(1, len(ranked_snubbers) + 1))
-    st.dataframe(
-        ranked_snubbers[["Rank", "Username", "Zero Vote Songs", "Total Submissions", "Snub Rate (%)"]],
-        use_container_width=True
+    return fig.to_json()
+
+# Standings after every round: one cumulative sum per season, then small cached figures per player count
+def load_standings(path, signature, db_path):
+    def compute():
+        if db_path:
+            return standings(query_store(db_path, path, signature, "round_points"))
+        return standings(round_points(load_facts(path, signature), load_data(path, signature)["rounds"]))
+    return season_artifact(path, signature, ("standings", db_path), compute, stateless=bool(db_path))
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def load_standings_figures(path, signature, db_path, top_n):
+    table = standings_chart_data(load_standings(path, signature, db_path), top_n, STANDINGS_MAX_ROUNDS)
+    players = table.loc[table["Round Number"] == table["Round Number"].max(), "Username"].tolist()
+    ranks = px.line(
+        table, x="Round Number", y="Rank", color="Username", markers=True,
+        hover_data=["Round", "Cumulative Points"], category_orders={"Username": players}
     )
+    ranks.update_yaxes(autorange="reversed")
+    race = px.bar(
+        table, x="Cumulative Points", y="Username", orientation="h", animation_frame="Round Number",
+        hover_data=["Round", "Rank"], category_orders={"Username": players},
+        range_x=[0, max(1, table["Cumulative Points"].max()) * 1.05]
+    )
+    race.update_layout(height=max(400, 30 * len(players)))
+    return ranks.to_json(), race.to_json()
+
+# Voter x voter similarity per season and method; blocs and figures are cached on top of it
+def load_similarity(path, signature, db_path, method):
+    def compute():
+        if db_path:
+            with closing(store.connect(db_path)) as conn:
+                vectors = store.vote_vectors(conn, path)
+            song_count = query_store(db_path, path, signature, "season_metrics")["Total Songs Submitted"]
+        else:
+            facts = load_facts(path, signature)
+            vectors, song_count = vote_vectors(facts), len(facts["submissions"])
+        return voter_similarity(vectors, song_count, method)
+    return season_artifact(path, signature, ("similarity", db_path, method), compute, stateless=bool(db_path))
+
+def load_blocs(path, signature, db_path, method, n_blocs):
+    return season_artifact(path, signature, ("blocs", db_path, method, n_blocs), lambda: voting_blocs(
+        load_similarity(path, signature, db_path, method), n_blocs
+    ), stateless=bool(db_path))
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def load_bloc_figure(path, signature, db_path, method, n_blocs):
+    matrix = bloc_matrix(
+        load_similarity(path, signature, db_path, method), load_blocs(path, signature, db_path, method, n_blocs), HEATMAP_MAX_SIZE
+    )
+    fig = px.imshow(matrix, color_continuous_scale="RdBu", zmin=-1, zmax=1)
+    fig.update_layout(height=600, xaxis_tickangle=-45)
+    return fig.to_json()
+
+# Opt-in stage timings (?profile=1 or MUSIC_LEAGUE_PROFILE=1), shown in the sidebar. Peak memory
+# needs process-wide tracing, so only the environment variable turns that on
+timer = StageTimer(profiling_enabled(st.query_params), memory_tracing_enabled())
+
+def render_cache_stats():
+    if timer.enabled:
+        st.sidebar.expander("🗄️ Shared season cache").dataframe(shared_cache().stats(), hide_index=True)
+
+if season_number == ALL_SEASONS:
+    with timer.stage("career aggregates"):
+        career = load_career(tuple((n, path, season_signature(path)) for n, path in season_paths.items()))
+
+    career_leaderboard_tab, career_snub_tab, rivals_tab, artist_tab = st.tabs([
+        "🏆 Career Leaderboard",
+        "🥲 Career Snubs",
+        "🤝 Supporters & Haters",
+        "🎨 Artist Trends"
+    ], key="career_section", on_change="rerun")
+    with career_leaderboard_tab:
+        if career_leaderboard_tab.open:
+            st.subheader("Top Players Across All Seasons")
+            st.dataframe(career["leaderboard"], width="stretch")
+
+    with career_snub_tab:
+        if career_snub_tab.open:
+            st.dataframe(career["snubs"], width="stretch")
+
+    with rivals_tab:
+        if rivals_tab.open:
+            names = career["names"]
+            selected_player = st.selectbox("Select a player", sorted(names.dropna().unique()))
+            player_ids = names.index[names == selected_player]
+
+            st.subheader("🙌 Career Supporters")
+            supporters = career["supporters"][career["supporters"]["Target ID"].isin(player_ids)]
+            st.dataframe(supporters[["Voter", "Total Points Given"]].reset_index(drop=True), width="stretch")
+
+            st.subheader("😤 Career Haters")
+            haters = career["haters"][career["haters"]["Target ID"].isin(player_ids) & (career["haters"]["Hate Points"] >= 2)]
+            st.dataframe(
+                haters[["Hater", "Seasons", "Hate Points", "Points Available", "Points Given to You", "Hate %"]].head(10).reset_index(drop=True),
+                width="stretch"
+            )
+
+    with artist_tab:
+        if artist_tab.open:
+            st.subheader("🎨 Most Submitted Artists by Season")
+            fig_trend = px.line(career["artists"], x="Season", y="Submissions", color="Artist", markers=True)
+            fig_trend.update_xaxes(dtick=1)
+            st.plotly_chart(fig_trend, width="stretch")
+            st.dataframe(
+                career["artists"].pivot_table(index="Artist", columns="Season", values="Submissions", fill_value=0),
+                width="stretch"
+            )
+
+    timer.render(st.sidebar)
+    render_cache_stats()
+    timer.log(season=season_number, section=st.session_state.get("career_section"))
+    st.stop()
+
+with timer.stage("load season"):
+    signature = season_signature(season_path)
+    if db_path:
+        ingest_season(db_path, season_path, signature)
+    else:
+        data = load_data(season_path, signature)
+        votes, submissions, rounds, competitors = data.values()
 
-with explore_tab:
-    round_map = rounds.set_index("ID")["Name"]
-    submitter_map = competitors.set_index("ID")["Name"]
-    summary_df = submissions.copy()
-    summary_df["Round Name"] = summary_df["Round ID"].map(round_map)
-    summary_df["Username"] = summary_df["Submitter ID"].map(submitter_map)
-    summary_df["Song Name"] = summary_df["Title"]
-    summary_df["Artist Name"] = summary_df["Artist(s)"].apply(lambda x: str(x).split(",")[0].strip())
-
-    vote_counts = votes.groupby("Spotify URI")["Points Assigned"].sum().reset_index()
-    vote_counts.columns = ["Spotify URI", "Number of Votes"]
-    summary_df = summary_df.merge(vote_counts, on="Spotify URI", how="left").fillna({"Number of Votes": 0})
-    summary_df["Number of Votes"] = summary_df["Number of Votes"].astype(int)
-    summary_table = summary_df[["Round Name", "Username", "Song Name", "Artist Name", "Number of Votes"]]
-
-    with st.expander("Filter table"):
-        selected_user = st.selectbox("Filter by Username", ["All"] + sorted(summary_table["Username"].dropna().unique()))
-        selected_round = st.selectbox("Filter by Round", ["All"] + sorted(summary_table["Round Name"].dropna().unique()))
-
-    filtered_table = summary_table.copy()
-    if selected_user != "All":
-        filtered_table = filtered_table[filtered_table["Username"] == selected_user]
-    if selected_round != "All":
-        filtered_table = filtered_table[filtered_table["Round Name"] == selected_round]
-
-    st.dataframe(filtered_table, use_container_width=True)
-
-with profile_tab:
-    all_players = competitors["Name"].dropna().sort_values().unique()
-    selected_player = st.selectbox("Select a player", all_players)
-
-    round_map = rounds.set_index("ID")["Name"]
-    submitter_map = competitors.set_index("ID")["Name"]
-
-    profile_subs = submissions.copy()
-    profile_subs["Round"] = profile_subs["Round ID"].map(round_map)
-    profile_subs["Username"] = profile_subs["Submitter ID"].map(submitter_map)
-    profile_subs["Primary Artist"] = profile_subs["Artist(s)"].apply(lambda x: str(x).split(",")[0].strip())
-
-    vote_counts = votes.groupby("Spotify URI")["Points Assigned"].sum().reset_index()
-    vote_counts.columns = ["Spotify URI", "Total Points"]
-    profile_subs = profile_subs.merge(vote_counts, on="Spotify URI", how="left").fillna({"Total Points": 0})
-    profile_subs["Total Points"] = profile_subs["Total Points"].astype(int)
+def query(name, *args):
+    return query_store(db_path, season_path, signature, name, *args)
 
-    player_subs = profile_subs[profile_subs["Username"] == selected_player]
+# Lazy tabs drop the state of widgets they don't render, so each choice is also copied to a
+# plain session_state entry and handed back as the widget's default when its tab opens again
+def _keep(name):
+    st.session_state[name] = st.session_state[f"{name}_widget"]
 
-    total = player_subs["Total Points"].sum()
-    avg = player_subs["Total Points"].mean()
-    best = player_subs.sort_values("Total Points", ascending=False).head(5)
-    worst = player_subs.sort_values("Total Points").head(5)
+def kept(name):
+    return {"key": f"{name}_widget", "on_change": _keep, "args": (name,)}
 
-    st.subheader(f"📊 Summary for {selected_player}")
-    st.write(f"**Total Points:** {total}")
-    st.write(f"**Average Points per Song:** {avg:.2f}")
+def kept_index(options, name):
+    options = list(options)
+    return options.index(st.session_state[name]) if st.session_state.get(name) in options else 0
 
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("#### 🔝 Best Song")
-        st.write(best[["Title", "Primary Artist", "Total Points", "Round"]].reset_index(drop=True))
-    with col2:
-        st.markdown("#### 🥶 Lowest Scoring Song")
-        st.write(worst[["Title", "Primary Artist", "Total Points", "Round"]].reset_index(drop=True))
+# Tabs (lazy: only the open tab runs its body, switching tabs triggers a rerun)
+overview_tab, leaderboard_tab, snub_tab, explore_tab, profile_tab, metrics_tab, blocs_tab = st.tabs([
+    "📅 Rounds & Participation",
+    "🏆 Leaderboard",
+    "🥲 Snubs",
+    "🔍 Explore",
+    "🎧 Player Profile",
+    "📈 Metrics Summary",
+    "🤝 Voting Blocs"
+], key="section", on_change="rerun")
+with overview_tab:
+    if overview_tab.open:
+        with timer.stage("participation"):
+            round_user_counts = query("round_participation") if db_path else round_participation(submissions, rounds)
+            st.dataframe(round_user_counts, width="stretch")
 
-    votes_extended = votes.merge(submissions[["Spotify URI", "Submitter ID"]], on="Spotify URI")
-    votes_extended = votes_extended[votes_extended["Submitter ID"] == competitors[competitors["Name"] == selected_player]["ID"].values[0]]
-    votes_extended = votes_extended.merge(competitors, left_on="Voter ID", right_on="ID", suffixes=("", "_voter"))
-    supporters = votes_extended.groupby("Name")["Points Assigned"].sum().reset_index().sort_values("Points Assigned", ascending=False)
+with leaderboard_tab:
+    if leaderboard_tab.open:
+        with timer.stage("leaderboard"):
+            st.subheader("Top Players by Points")
+            player_leaderboard = query("leaderboard") if db_path else load_leaderboard(season_path, signature)
+            st.dataframe(player_leaderboard, width="stretch")
+
+        st.subheader("📈 Standings Over Time")
+        standings_top = st.number_input(
+            "Players in the charts", min_value=1, max_value=50, value=st.session_state.get("standings_top", 10), step=1,
+            **kept("standings_top")
+        )
+        with timer.stage("standings"):
+            rank_json, race_json = load_standings_figures(season_path, signature, db_path, standings_top)
+            st.plotly_chart(pio.from_json(rank_json), width="stretch")
+            st.plotly_chart(pio.from_json(race_json), width="stretch")
+            st.caption("Lead changes")
+            st.dataframe(lead_changes(load_standings(season_path, signature, db_path)), hide_index=True, width="stretch")
 
-    st.subheader("🙌 Top Supporters")
-    st.write(supporters.rename(columns={"Name": "Voter", "Points Assigned": "Total Points Given"}).reset_index(drop=True))
+with metrics_tab:
+    if metrics_tab.open:
+        st.header("📈 Season Summary Metrics")
+        with timer.stage("metrics"):
+            metrics = query("season_metrics") if db_path else load_season_metrics(season_path, signature)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total Songs Submitted", metrics["Total Songs Submitted"])
+            st.metric("Total Votes Cast", metrics["Total Votes Cast"])
+            st.metric("Average Votes per Song", f"{metrics['Average Votes per Song']:.2f}")
+        with col2:
+            st.metric("Total Players", metrics["Total Players"])
+            st.metric("Average Points per Player", f"{metrics['Average Points per Player']:.2f}")
+
+        with timer.stage("artist charts"):
+            st.subheader("🎨 Most Submitted Artists")
+            artists = query("top_artists") if db_path else top_artists(submissions)
+            fig_artist = px.bar(artists, x="Submission Count", y="Artist", orientation="h")
+            st.plotly_chart(fig_artist)
+
+            st.subheader("🎵 Most Submitted Songs")
+            songs = query("top_songs") if db_path else top_songs(submissions)
+            fig_songs = px.bar(songs, x="Submission Count", y="Title", orientation="h", hover_data={"Primary Artist": True, "Title": False})
+            st.plotly_chart(fig_songs)
+
+        st.subheader("🔥 Voting Heatmap")
+
+        with st.expander("Heatmap options"):
+            heatmap_order = st.radio(
+                "Order players by", ["Name", "Cluster"], index=kept_index(["Name", "Cluster"], "heatmap_order"),
+                horizontal=True, **kept("heatmap_order")
+            )
+            player_options = list(query("player_names") if db_path else competitors["Name"].dropna().sort_values().unique())
+            heatmap_players = st.multiselect(
+                "Only these players", player_options,
+                default=[name for name in st.session_state.get("heatmap_players", []) if name in player_options],
+                **kept("heatmap_players")
+            )
+            heatmap_top = st.number_input(
+                "Top voters and submitters (0 for everyone)", min_value=0, value=st.session_state.get("heatmap_top", 0),
+                step=5, disabled=bool(heatmap_players), **kept("heatmap_top")
+            )
+
+        # Rows = voters, columns = submitters, values = total points given
+        with timer.stage("heatmap figure"):
+            fig = pio.from_json(load_heatmap_figure(
+                season_path, signature, db_path, heatmap_order.lower(), heatmap_top, tuple(heatmap_players)
+            ))
+            st.plotly_chart(fig, width="stretch")
 
-    st.subheader("😤 Your Biggest Haters")
+with snub_tab:
+    if snub_tab.open:
+        with timer.stage("snubs"):
+            ranked_snubbers = query("snub_rates") if db_path else load_snub_rates(season_path, signature)
+            st.dataframe(ranked_snubbers, width="stretch")
 
-    # Get the selected player's ID
-    selected_player_id = competitors[competitors["Name"] == selected_player]["ID"].values[0]
+with explore_tab:
+    if explore_tab.open:
+        with timer.stage("explore"):
+            if db_path:
+                usernames, round_names, artists = query("explore_filters")
+            else:
+                index = load_explore_index(season_path, signature)
+                usernames, round_names, artists = sorted(index["username"]), sorted(index["round"]), sorted(index["artist"])
+
+            with st.expander("Filter table"):
+                user_options, round_options, artist_options = ["All"] + usernames, ["All"] + round_names, ["All"] + artists
+                selected_user = st.selectbox(
+                    "Filter by Username", user_options, index=kept_index(user_options, "explore_user"), **kept("explore_user")
+                )
+                selected_round = st.selectbox(
+                    "Filter by Round", round_options, index=kept_index(round_options, "explore_round"), **kept("explore_round")
+                )
+                selected_artist = st.selectbox(
+                    "Filter by Artist", artist_options, index=kept_index(artist_options, "explore_artist"), **kept("explore_artist")
+                )
+                search = st.text_input(
+                    "Search titles, albums, artists and comments", value=st.session_state.get("explore_search", ""),
+                    **kept("explore_search")
+                )
+            filters = [None if value == "All" else value for value in (selected_user, selected_round, selected_artist)]
+
+            # Only the visible page is built and sent to the browser
+            if db_path:
+                page_table, total = query("explore_page", 1, EXPLORE_PAGE_SIZE, *filters, search)
+            else:
+                matches = explore_search(index, *filters, search)
+                total = len(matches)
+            pages = max(1, -(-total // EXPLORE_PAGE_SIZE))
+            page = 1
+            if pages > 1:
+                page = st.number_input(
+                    "Page", min_value=1, max_value=pages, value=1,
+                    key=f"explore_page:{selected_user}:{selected_round}:{selected_artist}:{search}"
+                )
+            st.caption(f"{total} songs · page {page} of {pages}")
 
-    # Get selected player's submissions
-    player_songs = submissions[submissions["Submitter ID"] == selected_player_id]
+            if not db_path:
+                page_table = explore_page(index, matches, page, EXPLORE_PAGE_SIZE)
+            elif page > 1:
+                page_table, total = query("explore_page", page, EXPLORE_PAGE_SIZE, *filters, search)
+            st.dataframe(page_table, width="stretch")
 
-    if len(player_songs) == 0:
-        st.write("No submissions found for this player.")
-    else:
-        # Calculate hate points using the proper method:
-        # Hate = (Total points voter had in round) - (Points given to target player)
-        hate_stats = []
-        other_players = competitors[competitors["ID"] != selected_player_id]
-        
-        for _, hater in other_players.iterrows():
-            hater_id = hater["ID"]
-            hater_name = hater["Name"]
-            total_hate_points = 0
-            round_breakdown = []
-            
-            # Check each round
-            for _, round_info in rounds.iterrows():
-                round_id = round_info["ID"]
-                round_name = round_info["Name"]
-                
-                # Get all votes this potential hater made in this round
-                hater_votes_in_round = votes[
-                    (votes["Voter ID"] == hater_id) & 
-                    (votes["Round ID"] == round_id)
-                ]
-                
-                if len(hater_votes_in_round) == 0:
-                    # Hater didn't participate - no hate points
-                    round_breakdown.append({
-                        "round": round_name,
-                        "participated": False,
-                        "total_points": 0,
-                        "points_to_player": 0,
-                        "hate_points": 0,
-                        "detail": "Didn't vote"
-                    })
-                else:
-                    # Calculate total points this hater had in this round
-                    total_points_in_round = hater_votes_in_round["Points Assigned"].sum()
-                    
-                    # Get selected player's songs in this round
-                    player_songs_in_round = player_songs[player_songs["Round ID"] == round_id]
-                    player_uris_in_round = player_songs_in_round["Spotify URI"].tolist()
-                    
-                    # Calculate points given to selected player in this round
-                    points_to_player = hater_votes_in_round[
-                        hater_votes_in_round["Spotify URI"].isin(player_uris_in_round)
-                    ]["Points Assigned"].sum()
-                    
-                    # Hate points = total points available - points given to player
-                    # BUT only if player had songs in this round
-                    hate_points_this_round = 0
-                    if len(player_songs_in_round) > 0:
-                        hate_points_this_round = total_points_in_round - points_to_player
-                    
-                    total_hate_points += hate_points_this_round
-                    
-                    round_breakdown.append({
-                        "round": round_name,
-                        "participated": True,
-                        "total_points": total_points_in_round,
-                        "points_to_player": points_to_player,
-                        "hate_points": hate_points_this_round,
-                        "player_songs_count": len(player_songs_in_round),
-                        "detail": f"Had {total_points_in_round} points, gave {points_to_player} to you = {hate_points_this_round} hate" if len(player_songs_in_round) > 0 else "You had no songs in this round"
-                    })
-            
-            hate_stats.append({
-                "hater": hater_name,
-                "total_hate_points": total_hate_points,
-                "round_breakdown": round_breakdown
-            })
-        
-        # Filter for people with more than 1 hate point and sort
-        hate_stats = [h for h in hate_stats if h["total_hate_points"] > 1]
-        hate_stats = sorted(hate_stats, key=lambda x: x["total_hate_points"], reverse=True)
-        
-        if len(hate_stats) == 0:
-            st.write("🎉 Great news! Nobody has more than 1 hate point against you. People are using their votes on you! 😊")
+with profile_tab:
+    if profile_tab.open:
+        all_players = query("player_names") if db_path else competitors["Name"].dropna().sort_values().unique()
+        selected_player = st.selectbox(
+            "Select a player", all_players, index=kept_index(all_players, "profile_player"), **kept("profile_player")
+        )
+
+        with timer.stage("profile index"):
+            if db_path:
+                profile = query("player_profile", selected_player)
+            else:
+                profile = player_profile(load_player_profiles(season_path, signature), selected_player)
+
+        st.subheader(f"📊 Summary for {selected_player}")
+        st.write(f"**Total Points:** {profile['total']}")
+        st.write(f"**Average Points per Song:** {profile['average']:.2f}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### 🔝 Best Song")
+            st.write(profile["best"])
+        with col2:
+            st.markdown("#### 🥶 Lowest Scoring Song")
+            st.write(profile["worst"])
+
+        st.subheader("🙌 Top Supporters")
+        st.write(profile["supporters"])
+
+        with timer.stage("similar voter"):
+            closest = most_similar_voters(load_similarity(season_path, signature, db_path, "cosine"))
+            closest = closest[closest["Username"] == selected_player]
+        if len(closest):
+            st.write(f"🤝 **Votes most like:** {closest['Most Similar Voter'].iloc[0]} (similarity {closest['Similarity'].iloc[0]:.2f})")
+
+        st.subheader("😤 Your Biggest Haters")
+
+        if not profile["has_songs"]:
+            st.write("No submissions found for this player.")
         else:
-            # Show top 5 haters
-            top_haters = hate_stats[:5]
+            # Hate = (Total points voter had in round) - (Points given to target player),
+            # precomputed for every (target, voter) pair in the season
+            top_haters = profile["haters"]
+
+            if len(top_haters) == 0:
+                st.write("🎉 Great news! Nobody has more than 1 hate point against you. People are using their votes on you! 😊")
+            else:
+                st.write(f"Found {profile['hater_count']} people with 2+ hate points against you:")
+
+                haters_df = top_haters.reset_index(drop=True)
+                haters_df.insert(0, "Rank", range(1, len(haters_df) + 1))
+                st.dataframe(haters_df, width="stretch")
+
+                # Show details for the biggest hater
+                biggest_hater = top_haters.iloc[0]
+                st.markdown(f"#### 👑 Your Biggest Hater: {biggest_hater['Hater']}")
+                st.write(f"***{biggest_hater['Hate Points']} total hate points***")
+                with st.expander("Round-by-round breakdown"):
+                    st.dataframe(profile["biggest_hater"], width="stretch")
+
+                # Create a bar chart of hate points
+                if len(top_haters) > 1:
+                    fig_hate = px.bar(
+                        top_haters,
+                        x="Hate Points",
+                        y="Hater",
+                        orientation="h",
+                        title=f"Who Has the Most Hate Points Against {selected_player}?",
+                        color="Hate Points",
+                        color_continuous_scale="Reds"
+                    )
+                    st.plotly_chart(fig_hate, width="stretch")
+
+        # Show voting allocation summary
+        st.subheader("🎯 How People Allocated Their Votes")
+
+        if len(profile["allocation"]) > 0:
+            st.dataframe(profile["allocation"], width="stretch")
+
+        # Updated explanation
+        with st.expander("ℹ️ How are 'Hate Points' calculated? (Vote-Based Method)"):
+            st.write("""
+            **PROPER METHOD - Based on Vote Allocation:**
             
-            st.write(f"Found {len(hate_stats)} people with 2+ hate points against you:")
+            🔥 **Hate Points** = (Total points voter had in round) - (Points given to you)
             
-            # Create haters dataframe for display
-            haters_display = []
-            for i, hater_data in enumerate(top_haters):
-                # Calculate some summary stats
-                participated_rounds = [r for r in hater_data["round_breakdown"] if r["participated"]]
-                total_points_available = sum(r["total_points"] for r in participated_rounds)
-                total_points_given = sum(r["points_to_player"] for r in participated_rounds)
-                
-                haters_display.append({
-                    "Rank": i + 1,
-                    "Hater": hater_data["hater"],
-                    "Hate Points": hater_data["total_hate_points"],
-                    "Points Available": total_points_available,
-                    "Points Given to You": total_points_given,
-                    "Hate %": f"{(hater_data['total_hate_points']/total_points_available*100):.1f}%" if total_points_available > 0 else "0%"
-                })
+            **Example calculation:**
+            - **Round A**: Annie has 5 points, gives you 0 → **5 hate points**
+            - **Round B**: Annie has 3 points, gives you 1 → **2 hate points**  
+            - **Round C**: Annie has 4 points, gives you 4 → **0 hate points**
+            - **Justin's total**: **7 hate points**
             
-            haters_df = pd.DataFrame(haters_display)
-            st.dataframe(haters_df, use_container_width=True)
-            
-            # Show details for the biggest hater
-            if len(top_haters) > 0:
-                biggest_hater = top_haters[0]
-                st.markdown(f"#### 👑 Your Biggest Hater: {biggest_hater['hater']}")
-                st.write(f"***{biggest_hater['total_hate_points']} total hate points***")
-                
-            
-            # Create a bar chart of hate points
-            if len(top_haters) > 1:
-                chart_data = pd.DataFrame({
-                    "Hater": [h["hater"] for h in top_haters],
-                    "Hate Points": [h["total_hate_points"] for h in top_haters]
-                })
-                
-                fig_hate = px.bar(
-                    chart_data, 
-                    x="Hate Points", 
-                    y="Hater", 
-                    orientation="h",
-                    title=f"Who Has the Most Hate Points Against {selected_player}?",
-                    color="Hate Points",
-                    color_continuous_scale="Reds"
-                )
-                st.plotly_chart(fig_hate, use_container_width=True)
-
-    # Show voting allocation summary
-    st.subheader("🎯 How People Allocated Their Votes")
-
-    vote_allocation = []
-    other_players = competitors[competitors["ID"] != selected_player_id]
-
-    for _, voter in other_players.iterrows():
-        voter_id = voter["ID"]
-        voter_name = voter["Name"]
-        
-        # Get all votes this person made to selected player's songs
-        votes_to_player = votes[
-            (votes["Voter ID"] == voter_id) & 
-            (votes["Spotify URI"].isin(player_songs["Spotify URI"]))
-        ]
-        
-        # Get all votes this person made total
-        all_votes_by_voter = votes[votes["Voter ID"] == voter_id]
-        
-        if len(all_votes_by_voter) > 0:
-            total_points_used = all_votes_by_voter["Points Assigned"].sum()
-            points_to_player = votes_to_player["Points Assigned"].sum()
-            hate_points = total_points_used - points_to_player
+            **Why this method works:**
+            - Accounts for actual voting power each person had
+            - Shows how much of their available votes they chose NOT to give you
+            - Fair across different rounds with different point allocations
+            - Higher hate = more points they could have given you but didn't
             
-            vote_allocation.append({
-                "Voter": voter_name,
-                "Total Points Used": total_points_used,
-                "Points to You": int(points_to_player),
-                "Hate Points": hate_points,
-                "Your Share %": f"{(points_to_player/total_points_used*100):.1f}%" if total_points_used > 0 else "0%"
-            })
-
-    if len(vote_allocation) > 0:
-        allocation_df = pd.DataFrame(vote_allocation)
-        allocation_df = allocation_df.sort_values("Points to You", ascending=False)
-        st.dataframe(allocation_df, use_container_width=True)
-
-    # Updated explanation
-    with st.expander("ℹ️ How are 'Hate Points' calculated? (Vote-Based Method)"):
-        st.write("""
-        **PROPER METHOD - Based on Vote Allocation:**
-        
-        🔥 **Hate Points** = (Total points voter had in round) - (Points given to you)
-        
-        **Example calculation:**
-        - **Round A**: Annie has 5 points, gives you 0 → **5 hate points**
-        - **Round B**: Annie has 3 points, gives you 1 → **2 hate points**  
-        - **Round C**: Annie has 4 points, gives you 4 → **0 hate points**
-        - **Justin's total**: **7 hate points**
-        
-        **Why this method works:**
-        - Accounts for actual voting power each person had
-        - Shows how much of their available votes they chose NOT to give you
-        - Fair across different rounds with different point allocations
-        - Higher hate = more points they could have given you but didn't
-        
-        **Note**: Only counts rounds where you had songs submitted.
-        """)
-    st.subheader("🎼 Submission History")
-    st.dataframe(player_subs[["Round", "Title", "Primary Artist", "Total Points"]].sort_values(by="Round"), use_container_width=True)
+            **Note**: Only counts rounds where you had songs submitted.
+            """)
+        st.subheader("🎼 Submission History")
+        st.dataframe(profile["history"], width="stretch")
+
+with blocs_tab:
+    if blocs_tab.open:
+        st.header("🤝 Voting Blocs")
+        col1, col2 = st.columns(2)
+        with col1:
+            similarity_method = st.radio(
+                "Similarity", ["Cosine", "Correlation"], index=kept_index(["Cosine", "Correlation"], "bloc_similarity"),
+                horizontal=True, **kept("bloc_similarity")
+            ).lower()
+        with col2:
+            n_blocs = st.number_input(
+                "Number of blocs", min_value=1, max_value=10, value=st.session_state.get("bloc_count", 3), step=1,
+                **kept("bloc_count")
+            )
+
+        with timer.stage("voting blocs"):
+            blocs = load_blocs(season_path, signature, db_path, similarity_method, n_blocs)
+            closest = most_similar_voters(load_similarity(season_path, signature, db_path, similarity_method))
+
+        st.caption("Players are compared on the points they gave every song this season. Cohesion is a player's average similarity to the rest of their bloc.")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Blocs")
+            st.dataframe(blocs, hide_index=True, width="stretch")
+        with col2:
+            st.subheader("Most Similar Voter")
+            st.dataframe(closest, hide_index=True, width="stretch")
+
+        st.subheader("Similarity by Bloc")
+        with timer.stage("bloc figure"):
+            st.plotly_chart(
+                pio.from_json(load_bloc_figure(season_path, signature, db_path, similarity_method, n_blocs)),
+                width="stretch"
+            )
+
+timer.render(st.sidebar)
+render_cache_stats()
+timer.log(season=season_number, section=st.session_state.get("section"))
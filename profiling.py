@@ -0,0 +1,95 @@
+import json
+import os
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+PROFILE_ENV = "MUSIC_LEAGUE_PROFILE"
+PROFILE_LOG_ENV = "MUSIC_LEAGUE_PROFILE_LOG"
+
+
+def _on(flag):
+    return str(flag).lower() in ("1", "true", "yes", "on")
+
+
+def profiling_enabled(query_params):
+    """On with ?profile=1 in the URL or MUSIC_LEAGUE_PROFILE=1 in the environment."""
+    return _on(query_params.get("profile") or os.environ.get(PROFILE_ENV, ""))
+
+
+def memory_tracing_enabled():
+    """Only MUSIC_LEAGUE_PROFILE=1 traces memory: tracemalloc slows every session in the process, not just one viewer's."""
+    return _on(os.environ.get(PROFILE_ENV, ""))
+
+
+def git_commit():
+    """Short hash of the checked-out commit, recorded with benchmark results; None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class StageTimer:
+    """Records wall time, and optionally peak traced memory, for named stages of one rerun.
+
+    Disabled timers are no-ops, so stages can stay in the code permanently. Peak
+    memory comes from tracemalloc, which is process-wide: with several sessions
+    running at once it includes their allocations too. The first tracing timer
+    starts tracemalloc and it stays on for the life of the process, so one
+    session's rerun never cuts off another's measurement. A stage during which
+    tracing was not running throughout reports a peak of None.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.stages = []
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_mb = None
+            if tracing and tracemalloc.is_tracing():
+                peak_mb = round(max(tracemalloc.get_traced_memory()[1] - start_memory, 0) / 2**20, 2)
+            self.stages.append({"stage": name, "ms": round(seconds * 1000, 2), "peak_mb": peak_mb})
+
+    def table(self):
+        columns = ["stage", "ms", "peak_mb"] if self.trace_memory else ["stage", "ms"]
+        return pd.DataFrame(self.stages, columns=columns)
+
+    def render(self, container):
+        if not self.enabled:
+            return
+        table = self.table()
+        panel = container.expander("⏱️ Stage timings", expanded=True)
+        panel.caption(f"Total: {table['ms'].sum():.1f} ms")
+        panel.dataframe(table, hide_index=True, width="stretch")
+
+    def log(self, path=None, **context):
+        """Append this rerun's stages as one JSON line to `path` (or $MUSIC_LEAGUE_PROFILE_LOG)."""
+        path = path or os.environ.get(PROFILE_LOG_ENV)
+        if not self.enabled or not path:
+            return
+        entry = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), **context, "stages": self.stages}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
@@ -0,0 +1,193 @@
+"""Pre-render static JSON/HTML reports for every season, without Streamlit.
+
+    python report.py                       # every exports/season_* -> reports/
+    python report.py --seasons 1 2 --workers 2
+"""
+import argparse
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.express as px
+
+from analytics import (
+    allocation_matrix,
+    build_facts,
+    hate_matrix,
+    lead_changes,
+    leaderboard,
+    most_similar_voters,
+    player_profile,
+    player_profiles,
+    round_participation,
+    round_points,
+    season_metrics,
+    snub_rates,
+    standings,
+    top_artists,
+    top_songs,
+    vote_vectors,
+    voter_similarity,
+    voting_blocs,
+    voting_heatmap,
+)
+from loader import exports_root, find_seasons, load_season
+
+PROFILE_TABLES = ["best", "worst", "supporters", "haters", "allocation", "history"]
+
+
+def season_report(path):
+    """Every dashboard section for one season, as plain frames and dicts."""
+    data = load_season(path)
+    facts = build_facts(**data)
+    rounds, competitors = data["rounds"], data["competitors"]
+    hate = hate_matrix(facts, rounds, competitors)
+    allocation = allocation_matrix(facts, competitors)
+    profiles = player_profiles(facts, hate, allocation, rounds, competitors)
+    table = standings(round_points(facts, rounds))
+    similarity = voter_similarity(vote_vectors(facts), len(facts["submissions"]))
+    return {
+        "participation": round_participation(data["submissions"], rounds),
+        "leaderboard": leaderboard(facts),
+        "standings": table,
+        "lead_changes": lead_changes(table),
+        "metrics": season_metrics(facts, competitors),
+        "snubs": snub_rates(facts),
+        "top_artists": top_artists(data["submissions"]),
+        "top_songs": top_songs(data["submissions"]),
+        "heatmap": voting_heatmap(facts),
+        "blocs": voting_blocs(similarity),
+        "most_similar": most_similar_voters(similarity),
+        "profiles": {name: player_profile(profiles, name) for name in profiles["players"]},
+    }
+
+
+def _records(df):
+    df = df.reset_index(drop=True)
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def report_json(report):
+    heatmap = report["heatmap"]
+    return {
+        "participation": _records(report["participation"]),
+        "leaderboard": _records(report["leaderboard"]),
+        "standings": _records(report["standings"]),
+        "lead_changes": _records(report["lead_changes"]),
+        "metrics": report["metrics"],
+        "snubs": _records(report["snubs"]),
+        "top_artists": _records(report["top_artists"]),
+        "top_songs": _records(report["top_songs"]),
+        "heatmap": {
+            "voters": heatmap.index.tolist(),
+            "submitters": heatmap.columns.tolist(),
+            "points": heatmap.to_numpy().tolist(),
+        },
+        "blocs": _records(report["blocs"]),
+        "most_similar": _records(report["most_similar"]),
+        "profiles": {
+            name: {
+                "total": profile["total"],
+                "average": None if pd.isna(profile["average"]) else profile["average"],
+                "hater_count": profile["hater_count"],
+                **{table: _records(profile[table]) for table in PROFILE_TABLES},
+            }
+            for name, profile in report["profiles"].items()
+        },
+    }
+
+
+def _table(df):
+    return df.to_html(index=False, border=0, classes="table", na_rep="")
+
+
+def report_html(title, report):
+    heatmap = px.imshow(
+        report["heatmap"],
+        labels=dict(x="Submitter", y="Voter", color="Points"),
+        color_continuous_scale="viridis"
+    )
+    heatmap.update_layout(height=600, xaxis_tickangle=-45)
+    metrics = "".join(
+        f"<li><b>{html.escape(name)}:</b> {value:.2f}</li>" if isinstance(value, float) else f"<li><b>{html.escape(name)}:</b> {value}</li>"
+        for name, value in report["metrics"].items()
+    )
+    sections = [
+        f"<h1>{html.escape(title)}</h1>",
+        "<h2>📅 Rounds & Participation</h2>", _table(report["participation"]),
+        "<h2>🏆 Leaderboard</h2>", _table(report["leaderboard"]),
+        "<h3>📈 Lead Changes</h3>", _table(report["lead_changes"]),
+        "<h2>🥲 Snubs</h2>", _table(report["snubs"]),
+        "<h2>📈 Metrics Summary</h2>", f"<ul>{metrics}</ul>",
+        "<h3>🎨 Most Submitted Artists</h3>", _table(report["top_artists"]),
+        "<h3>🎵 Most Submitted Songs</h3>", _table(report["top_songs"]),
+        "<h3>🔥 Voting Heatmap</h3>", heatmap.to_html(full_html=False, include_plotlyjs="cdn"),
+        "<h2>🤝 Voting Blocs</h2>", _table(report["blocs"]),
+        "<h3>Most Similar Voter</h3>", _table(report["most_similar"]),
+        "<h2>🎧 Player Profiles</h2>",
+    ]
+    for name, profile in report["profiles"].items():
+        sections.append(
+            f"<details><summary>{html.escape(name)}: {profile['total']} points</summary>"
+            + "".join(f"<h4>{table.title()}</h4>{_table(profile[table])}" for table in PROFILE_TABLES)
+            + "</details>"
+        )
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(title)}</title></head><body>{''.join(sections)}</body></html>"
+    )
+
+
+def write_season_report(season_number, path, out_dir):
+    """Build one season's report and write season_N.json / season_N.html. Runs in a worker process."""
+    report = season_report(path)
+    stem = os.path.join(out_dir, f"season_{season_number}")
+    with open(f"{stem}.json", "w", encoding="utf-8") as f:
+        json.dump(report_json(report), f, ensure_ascii=False, default=str)
+    with open(f"{stem}.html", "w", encoding="utf-8") as f:
+        f.write(report_html(f"Season {season_number}", report))
+    return season_number
+
+
+def write_index(out_dir):
+    """index.html linking every season report in `out_dir`, including ones from earlier runs."""
+    season_numbers = sorted(
+        int(name[len("season_"):-len(".json")])
+        for name in os.listdir(out_dir)
+        if name.startswith("season_") and name.endswith(".json")
+    )
+    links = "".join(
+        f"<li>Season {n}: <a href='season_{n}.html'>HTML</a> · <a href='season_{n}.json'>JSON</a></li>"
+        for n in season_numbers
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Music League</title></head><body><ul>{links}</ul></body></html>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exports", default=exports_root(), help="directory holding season_N export folders (default: $MUSIC_LEAGUE_EXPORTS or exports/)")
+    parser.add_argument("--out", default="reports", help="where to write the reports")
+    parser.add_argument("--seasons", type=int, nargs="*", help="season numbers to build (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    seasons = find_seasons(args.exports)
+    if args.seasons:
+        missing = set(args.seasons) - set(seasons)
+        if missing:
+            parser.error(f"no export folder for season(s) {sorted(missing)}")
+        seasons = {n: seasons[n] for n in args.seasons}
+
+    os.makedirs(args.out, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(write_season_report, n, path, args.out) for n, path in seasons.items()]
+        for future in futures:
+            print(f"Season {future.result()} written to {args.out}")
+    write_index(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Season data and derived tables computed once and shared by every dashboard session.
+
+`st.cache_data` hands every caller its own copy, so a crowd opening the dashboard at once
+pays for copying each season's frames on every rerun, and its caches grow without bound.
+A SeasonCache keeps one read-only copy per season. Seasons past the season or memory budget
+are evicted least recently used first. Sessions that ask for a season, or a table, that
+another session is already computing wait for that result instead of computing it again.
+"""
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from incremental import load_state, refresh_state
+from loader import season_signature
+
+CACHE_SEASONS_ENV = "MUSIC_LEAGUE_CACHE_SEASONS"
+CACHE_MB_ENV = "MUSIC_LEAGUE_CACHE_MB"
+
+
+def _size(value, seen=None):
+    """Deep memory of a cached value: frames and arrays as measured, containers summed, anything else pickled.
+
+    Objects reachable twice (a profile holding the hate matrix) are counted once.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True, deep=True)))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_size(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_size(item, seen) for item in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def _state_bytes(state):
+    """Deep memory of a season's loaded frames and fact tables."""
+    return _size([*state["data"].values(), *state["facts"].values()])
+
+
+class _Season:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.state = None
+        self.state_bytes = 0
+        # key: (signature, value, bytes)
+        self.artifacts = {}
+        self.artifact_locks = {}
+        # Keys whose artifacts can be brought up to date from appended rows
+        self.updatable = set()
+        # Calls currently loading or reading this season; such seasons are not evicted
+        self.users = 0
+
+    @property
+    def bytes(self):
+        return self.state_bytes + sum(size for _, _, size in list(self.artifacts.values()))
+
+
+class SeasonCache:
+    """LRU of season states (see incremental.py) and per-season artifacts, safe to share across threads.
+
+    `max_seasons` and `max_mb` default to $MUSIC_LEAGUE_CACHE_SEASONS (4) and $MUSIC_LEAGUE_CACHE_MB
+    (no limit); memory is estimated from each season's frames and stored artifacts. Seasons that a
+    call is still loading or computing for are never evicted, so their results are not lost.
+    """
+
+    def __init__(self, max_seasons=None, max_mb=None):
+        self.max_seasons = max_seasons or int(os.environ.get(CACHE_SEASONS_ENV) or 4)
+        max_mb = max_mb or os.environ.get(CACHE_MB_ENV)
+        self.max_bytes = float(max_mb) * 2**20 if max_mb else None
+        self._lock = threading.Lock()
+        self._seasons = OrderedDict()
+
+    @contextmanager
+    def _use(self, path):
+        """The season's entry, marked most recently used and protected from eviction until the block ends."""
+        with self._lock:
+            season = self._seasons.get(path)
+            if season is None:
+                season = self._seasons[path] = _Season()
+            self._seasons.move_to_end(path)
+            season.users += 1
+        try:
+            yield season
+        finally:
+            with self._lock:
+                season.users -= 1
+
+    def _over_budget(self):
+        return len(self._seasons) > self.max_seasons or (
+            self.max_bytes and sum(season.bytes for season in self._seasons.values()) > self.max_bytes
+        )
+
+    def _evict(self):
+        with self._lock:
+            for path in list(self._seasons):
+                if not self._over_budget():
+                    break
+                if not self._seasons[path].users:
+                    del self._seasons[path]
+
+    def state(self, path, signature):
+        """The season's data and facts, loaded (or brought up to date from appended rows) once for everyone.
+
+        `signature` is the caller's view of the export. When it differs from the cached state the
+        files are checked again, so a caller holding an older signature gets the newer state instead
+        of forcing a reload.
+        """
+        with self._use(path) as season:
+            with season.lock:
+                if season.state is not None and season.state["signature"] == signature:
+                    return season.state
+                if season.state is None:
+                    season.state = load_state(path)
+                elif season.state["signature"] != season_signature(path):
+                    season.state = refresh_state(season.state, path)
+                    # Appended rows keep the artifacts that can apply them; everything else is recomputed
+                    keep = season.updatable if season.state["update"] == "appended" else set()
+                    season.artifacts = {key: cached for key, cached in season.artifacts.items() if key in keep}
+                else:
+                    return season.state
+                season.state_bytes = _state_bytes(season.state)
+                state = season.state
+            self._evict()
+            return state
+
+    def artifact(self, path, signature, key, compute, update=None, stateless=False):
+        """`compute()` for this season and `key`, run once and shared until the export changes or the season is evicted.
+
+        Artifacts are kept for the signature of the state they were computed from, not the caller's.
+        When rows were appended to the export, `update(old value, state)` brings the artifact up to
+        date from the state's changes instead; it may return None to compute from scratch.
+        `stateless` artifacts (read from the SQLite backend) never load the season's frames and are
+        kept for the caller's signature.
+        """
+        with self._use(path) as season:
+            state = None if stateless else self.state(path, signature)
+            current = signature if stateless else state["signature"]
+            with season.lock:
+                lock = season.artifact_locks.setdefault(key, threading.Lock())
+                if update is not None:
+                    season.updatable.add(key)
+            with lock:
+                cached = season.artifacts.get(key)
+                if cached is not None and cached[0] == current:
+                    return cached[1]
+                value = None
+                if cached is not None and update is not None and state.get("previous") == cached[0]:
+                    value = update(cached[1], state)
+                if value is None:
+                    value = compute()
+                season.artifacts[key] = (current, value, _size(value))
+            self._evict()
+            return value
+
+    def stats(self):
+        """One row per cached season, least recently used first."""
+        with self._lock:
+            seasons = list(self._seasons.items())
+        return [
+            {"season": path, "mb": round(season.bytes / 2**20, 1), "artifacts": len(season.artifacts)}
+            for path, season in seasons
+        ]
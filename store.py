@@ -0,0 +1,429 @@
+"""Optional SQLite backend: ingest each season's CSVs once, then answer every tab with SQL.
+
+Set MUSIC_LEAGUE_DB=path/to/league.sqlite to use it from the dashboard. A season is
+re-ingested only when its CSV signature changes; queries return just the rows a
+widget shows, so nothing season-sized stays in memory between reruns.
+"""
+import json
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from analytics import build_facts
+from loader import load_season, season_signature
+
+DB_ENV = "MUSIC_LEAGUE_DB"
+# Bump when the schema changes so existing databases re-ingest every season
+SCHEMA_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (season TEXT PRIMARY KEY, signature TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS competitors (season TEXT NOT NULL, position INTEGER, id TEXT, name TEXT);
+CREATE TABLE IF NOT EXISTS rounds (season TEXT NOT NULL, position INTEGER, id TEXT, name TEXT, created TEXT);
+CREATE TABLE IF NOT EXISTS submissions (
+    season TEXT NOT NULL, position INTEGER, spotify_uri TEXT, round_id TEXT, submitter_id TEXT,
+    title TEXT, primary_artist TEXT, total_points INTEGER
+);
+CREATE TABLE IF NOT EXISTS votes (
+    season TEXT NOT NULL, spotify_uri TEXT, round_id TEXT, voter_id TEXT, submitter_id TEXT, points INTEGER
+);
+-- Token index for the Explore search. Accents are kept, as in analytics.explore_index
+CREATE VIRTUAL TABLE IF NOT EXISTS submissions_search USING fts5(
+    season UNINDEXED, position UNINDEXED, title, album, artists, comment,
+    tokenize = "unicode61 remove_diacritics 0"
+);
+CREATE INDEX IF NOT EXISTS competitors_id ON competitors (season, id);
+CREATE INDEX IF NOT EXISTS rounds_id ON rounds (season, id);
+CREATE INDEX IF NOT EXISTS submissions_submitter ON submissions (season, submitter_id);
+CREATE INDEX IF NOT EXISTS submissions_round ON submissions (season, round_id);
+CREATE INDEX IF NOT EXISTS submissions_artist ON submissions (season, primary_artist);
+CREATE INDEX IF NOT EXISTS submissions_song ON submissions (season, spotify_uri, round_id);
+-- Covering indexes (points included) so the per-voter/per-submitter/per-song sums stream from the index
+CREATE INDEX IF NOT EXISTS votes_voter ON votes (season, voter_id, round_id, points);
+CREATE INDEX IF NOT EXISTS votes_submitter ON votes (season, submitter_id, voter_id, points);
+CREATE INDEX IF NOT EXISTS votes_song ON votes (season, spotify_uri, round_id, points);
+"""
+
+TABLES = ("competitors", "rounds", "submissions", "submissions_search", "votes")
+
+
+def database_path():
+    """The backend's database file, or None when the in-memory pandas path should be used."""
+    return os.environ.get(DB_ENV) or None
+
+
+def connect(db_path):
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # CREATE ... IF NOT EXISTS keeps an older search table's tokenizer, so rebuild it
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS submissions_search")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _season(path):
+    return os.path.abspath(path)
+
+
+def _rows(df, season):
+    df = df.astype(object).where(df.notna(), None)
+    return [(season, *row) for row in df.itertuples(index=False, name=None)]
+
+
+def ingest_season(conn, path):
+    """Load one season's CSVs into the database unless it already holds this export. True if it ingested."""
+    season = _season(path)
+    signature = json.dumps([SCHEMA_VERSION, season_signature(path)])
+    stored = conn.execute("SELECT signature FROM sources WHERE season = ?", (season,)).fetchone()
+    if stored and stored[0] == signature:
+        return False
+
+    data = load_season(path)
+    facts = build_facts(**data)
+    frames = {
+        "competitors": data["competitors"].assign(position=range(len(data["competitors"])))[["position", "ID", "Name"]],
+        "rounds": data["rounds"].assign(
+            position=range(len(data["rounds"])), created=data["rounds"]["Created"].astype(str)
+        )[["position", "ID", "Name", "created"]],
+        "submissions": facts["submissions"].assign(position=range(len(facts["submissions"])))[
+            ["position", "Spotify URI", "Round ID", "Submitter ID", "Title", "Primary Artist", "Total Points"]
+        ],
+        "submissions_search": data["submissions"].assign(position=range(len(data["submissions"])))[
+            ["position", "Title", "Album", "Artist(s)", "Comment"]
+        ],
+        "votes": facts["votes"][["Spotify URI", "Round ID", "Voter ID", "Submitter ID", "Points Assigned"]],
+    }
+    with conn:
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE season = ?", (season,))
+            placeholders = ", ".join("?" * (frames[table].shape[1] + 1))
+            conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", _rows(frames[table], season))
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (season, signature))
+    return True
+
+
+def _query(conn, sql, **params):
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def round_participation(conn, path):
+    participation = _query(conn, """
+        SELECT r.name AS "Round Name", r.created AS "Created At",
+               COUNT(DISTINCT s.submitter_id) AS "Number of Participants"
+        FROM submissions s
+        LEFT JOIN rounds r ON r.season = s.season AND r.id = s.round_id
+        WHERE s.season = :season
+        GROUP BY s.round_id
+        ORDER BY r.created, s.round_id
+    """, season=_season(path))
+    participation["Created At"] = pd.to_datetime(participation["Created At"]).dt.date
+    return participation
+
+
+def leaderboard(conn, path):
+    return _query(conn, """
+        SELECT c.name AS "Username", SUM(v.points) AS "Total Points"
+        FROM (
+            SELECT submitter_id, SUM(points) AS points FROM votes WHERE season = :season GROUP BY submitter_id
+        ) v
+        JOIN competitors c ON c.season = :season AND c.id = v.submitter_id
+        WHERE c.name IS NOT NULL
+        GROUP BY c.name
+        ORDER BY "Total Points" DESC, "Username"
+    """, season=_season(path))
+
+
+def round_points(conn, path):
+    """Points per round and player, like analytics.round_points; standings are built from it in pandas."""
+    points = _query(conn, """
+        SELECT s.round_id AS "Round ID", r.name AS "Round", r.created AS "Created", c.name AS "Username",
+               SUM(s.total_points) AS "Points"
+        FROM submissions s
+        JOIN competitors c ON c.season = s.season AND c.id = s.submitter_id
+        LEFT JOIN rounds r ON r.season = s.season AND r.id = s.round_id
+        WHERE s.season = :season AND c.name IS NOT NULL
+        GROUP BY s.round_id, c.name
+    """, season=_season(path))
+    points["Created"] = pd.to_datetime(points["Created"])
+    return points
+
+
+def season_metrics(conn, path):
+    season = _season(path)
+    row = conn.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM submissions WHERE season = :season),
+            (SELECT COUNT(*) FROM votes WHERE season = :season),
+            (SELECT AVG(points) FROM (
+                SELECT SUM(points) AS points FROM votes WHERE season = :season GROUP BY spotify_uri, round_id
+            )),
+            (SELECT COUNT(*) FROM competitors WHERE season = :season),
+            (SELECT AVG(points) FROM (
+                SELECT SUM(points) AS points FROM votes
+                WHERE season = :season AND submitter_id IS NOT NULL GROUP BY submitter_id
+            ))
+    """, {"season": season}).fetchone()
+    names = ["Total Songs Submitted", "Total Votes Cast", "Average Votes per Song", "Total Players", "Average Points per Player"]
+    return {name: float(value) if "Average" in name else value for name, value in zip(names, row)}
+
+
+def top_artists(conn, path, n=10):
+    return _query(conn, """
+        SELECT primary_artist AS "Artist", COUNT(*) AS "Submission Count"
+        FROM submissions WHERE season = :season
+        GROUP BY primary_artist
+        ORDER BY "Submission Count" DESC, "Artist"
+        LIMIT :n
+    """, season=_season(path), n=n)
+
+
+def top_songs(conn, path, n=10):
+    return _query(conn, """
+        SELECT title AS "Title", primary_artist AS "Primary Artist", COUNT(*) AS "Submission Count"
+        FROM submissions WHERE season = :season
+        GROUP BY title, primary_artist
+        HAVING COUNT(*) > 1
+        ORDER BY "Submission Count" DESC, "Title", "Primary Artist"
+        LIMIT :n
+    """, season=_season(path), n=n)
+
+
+def heatmap_points(conn, path):
+    """Voter -> submitter point totals as a long frame, like analytics.heatmap_points."""
+    return _query(conn, """
+        SELECT voter.name AS "Voter", submitter.name AS "Submitter", v.points AS "Points"
+        FROM (
+            SELECT voter_id, submitter_id, SUM(points) AS points FROM votes
+            WHERE season = :season GROUP BY voter_id, submitter_id
+        ) v
+        JOIN competitors voter ON voter.season = :season AND voter.id = v.voter_id
+        JOIN competitors submitter ON submitter.season = :season AND submitter.id = v.submitter_id
+        WHERE voter.name IS NOT NULL AND submitter.name IS NOT NULL
+    """, season=_season(path))
+
+
+def vote_vectors(conn, path):
+    """(Voter, Song, Points) per vote on a known submission, like analytics.vote_vectors; songs are submission positions."""
+    return _query(conn, """
+        SELECT c.name AS "Voter", s.position AS "Song", v.points AS "Points"
+        FROM votes v
+        JOIN submissions s ON s.season = v.season AND s.spotify_uri = v.spotify_uri AND s.round_id = v.round_id
+        JOIN competitors c ON c.season = v.season AND c.id = v.voter_id
+        WHERE v.season = :season AND c.name IS NOT NULL
+    """, season=_season(path))
+
+
+def snub_rates(conn, path, min_submissions=2):
+    stats = _query(conn, """
+        SELECT c.name AS "Username", SUM(s.total_points = 0) AS "Zero Vote Songs", COUNT(*) AS "Total Submissions"
+        FROM submissions s
+        JOIN competitors c ON c.season = s.season AND c.id = s.submitter_id
+        WHERE s.season = :season AND c.name IS NOT NULL
+        GROUP BY c.name
+        HAVING "Zero Vote Songs" > 0 AND "Total Submissions" >= :min_submissions
+        ORDER BY "Username"
+    """, season=_season(path), min_submissions=min_submissions)
+    # Rounded in pandas so rates match analytics.snub_rates exactly
+    stats["Snub Rate (%)"] = (stats["Zero Vote Songs"] / stats["Total Submissions"] * 100).round(1)
+    ranked = stats.sort_values(by="Snub Rate (%)", ascending=False, kind="stable").reset_index(drop=True)
+    ranked.insert(0, "Rank", range(1, len(ranked) + 1))
+    return ranked
+
+
+def explore_filters(conn, path):
+    """(usernames, round names, artists) with at least one submission, for the Explore filters."""
+    season = _season(path)
+    users = conn.execute("""
+        SELECT DISTINCT c.name FROM submissions s
+        JOIN competitors c ON c.season = s.season AND c.id = s.submitter_id
+        WHERE s.season = ? AND c.name IS NOT NULL ORDER BY c.name
+    """, (season,)).fetchall()
+    rounds = conn.execute("""
+        SELECT DISTINCT r.name FROM submissions s
+        JOIN rounds r ON r.season = s.season AND r.id = s.round_id
+        WHERE s.season = ? AND r.name IS NOT NULL ORDER BY r.name
+    """, (season,)).fetchall()
+    artists = conn.execute(
+        "SELECT DISTINCT primary_artist FROM submissions WHERE season = ? ORDER BY primary_artist", (season,)
+    ).fetchall()
+    return [name for name, in users], [name for name, in rounds], [name for name, in artists]
+
+
+def explore_page(conn, path, page, page_size, username=None, round_name=None, artist=None, text=None):
+    """(one page of Explore rows, total matches), filtered in SQL; None means no filter.
+
+    `text` matches word prefixes in title, album, artists and comment through the FTS index.
+    """
+    params = {"season": _season(path)}
+    filters = ["s.season = :season"]
+    if username is not None:
+        filters.append("c.name = :username")
+        params["username"] = username
+    if round_name is not None:
+        filters.append("r.name = :round_name")
+        params["round_name"] = round_name
+    if artist is not None:
+        filters.append("s.primary_artist = :artist")
+        params["artist"] = artist
+    tokens = re.findall(r"\w+", (text or "").lower())
+    if tokens:
+        filters.append("""s.position IN (
+            SELECT position FROM submissions_search WHERE submissions_search MATCH :match AND season = :season
+        )""")
+        params["match"] = " ".join(f'"{token}"*' for token in tokens)
+
+    source = f"""
+        FROM submissions s
+        LEFT JOIN rounds r ON r.season = s.season AND r.id = s.round_id
+        LEFT JOIN competitors c ON c.season = s.season AND c.id = s.submitter_id
+        WHERE {" AND ".join(filters)}
+    """
+    total = conn.execute(f"SELECT COUNT(*) {source}", params).fetchone()[0]
+    rows = _query(conn, f"""
+        SELECT s.position, r.name AS "Round Name", c.name AS "Username", s.title AS "Song Name",
+               s.primary_artist AS "Artist Name", s.total_points AS "Number of Votes"
+        {source}
+        ORDER BY s.position
+        LIMIT :limit OFFSET :offset
+    """, limit=page_size, offset=(page - 1) * page_size, **params)
+    return rows.set_index("position").rename_axis(None), total
+
+
+def player_names(conn, path):
+    rows = conn.execute(
+        "SELECT DISTINCT name FROM competitors WHERE season = ? AND name IS NOT NULL ORDER BY name", (_season(path),)
+    ).fetchall()
+    return [name for name, in rows]
+
+
+def _percent(points, available):
+    return [f"{(p / a * 100):.1f}%" if a > 0 else "0%" for p, a in zip(points, available)]
+
+
+# Per-round points each voter handed out, and the rounds the target had songs in
+PLAYER_CTES = """
+    voter_rounds AS (
+        SELECT v.voter_id, v.round_id, r.position, SUM(v.points) AS total
+        FROM votes v JOIN rounds r ON r.season = v.season AND r.id = v.round_id
+        WHERE v.season = :season
+        GROUP BY v.voter_id, v.round_id
+    ),
+    target_rounds AS (
+        SELECT DISTINCT round_id FROM submissions WHERE season = :season AND submitter_id = :target
+    )
+"""
+
+
+def player_profile(conn, path, name):
+    """Everything the Player Profile tab shows for one player, in the shape of analytics.player_profiles."""
+    season = _season(path)
+    row = conn.execute(
+        "SELECT id FROM competitors WHERE season = ? AND name = ? ORDER BY position LIMIT 1", (season, name)
+    ).fetchone()
+    if row is None:
+        raise KeyError(name)
+    params = {"season": season, "target": row[0]}
+
+    songs = """
+        SELECT s.position, s.title AS "Title", s.primary_artist AS "Primary Artist",
+               s.total_points AS "Total Points", r.name AS "Round"
+        FROM submissions s LEFT JOIN rounds r ON r.season = s.season AND r.id = s.round_id
+        WHERE s.season = :season AND s.submitter_id = :target
+    """
+    best = _query(conn, songs + 'ORDER BY "Total Points" DESC, s.position LIMIT 5', **params)
+    worst = _query(conn, songs + 'ORDER BY "Total Points", s.position LIMIT 5', **params)
+    history = _query(conn, songs + 'ORDER BY "Round" IS NULL, "Round", s.position', **params)
+
+    supporters = _query(conn, """
+        SELECT c.name AS "Voter", SUM(v.points) AS "Total Points Given"
+        FROM votes v JOIN competitors c ON c.season = v.season AND c.id = v.voter_id
+        WHERE v.season = :season AND v.submitter_id = :target AND c.name IS NOT NULL
+        GROUP BY c.name
+        ORDER BY "Total Points Given" DESC, "Voter"
+    """, **params)
+
+    haters = _query(conn, f"""
+        WITH {PLAYER_CTES},
+        given AS (
+            SELECT voter_id, SUM(points) AS given FROM votes
+            WHERE season = :season AND submitter_id = :target GROUP BY voter_id
+        ),
+        available AS (
+            SELECT voter_id, SUM(total) AS available,
+                   SUM(CASE WHEN round_id IN target_rounds THEN total ELSE 0 END) AS exposed
+            FROM voter_rounds GROUP BY voter_id
+        )
+        SELECT * FROM (
+            SELECT c.id AS "Voter ID", c.name AS "Hater",
+                   COALESCE(a.exposed, 0) - COALESCE(g.given, 0) AS "Hate Points",
+                   COALESCE(a.available, 0) AS "Points Available",
+                   COALESCE(g.given, 0) AS "Points Given to You",
+                   c.position
+            FROM competitors c
+            LEFT JOIN available a ON a.voter_id = c.id
+            LEFT JOIN given g ON g.voter_id = c.id
+            WHERE c.season = :season AND c.id != :target
+        )
+        WHERE "Hate Points" >= 2
+        ORDER BY "Hate Points" DESC, position
+    """, **params).drop(columns="position")
+    haters["Hate %"] = _percent(haters["Hate Points"], haters["Points Available"])
+
+    breakdown = pd.DataFrame(columns=["Round", "Total Points", "Points to You", "Hate Points"])
+    if len(haters):
+        breakdown = _query(conn, f"""
+            WITH {PLAYER_CTES},
+            given AS (
+                SELECT round_id, SUM(points) AS given FROM votes
+                WHERE season = :season AND voter_id = :voter AND submitter_id = :target GROUP BY round_id
+            )
+            SELECT r.name AS "Round", vr.total AS "Total Points", COALESCE(g.given, 0) AS "Points to You",
+                   CASE WHEN vr.round_id IN target_rounds THEN vr.total - COALESCE(g.given, 0) ELSE 0 END AS "Hate Points"
+            FROM voter_rounds vr
+            JOIN rounds r ON r.season = :season AND r.id = vr.round_id
+            LEFT JOIN given g ON g.round_id = vr.round_id
+            WHERE vr.voter_id = :voter
+            ORDER BY vr.position
+        """, voter=haters["Voter ID"].iloc[0], **params)
+
+    allocation = _query(conn, """
+        WITH used AS (
+            SELECT voter_id, SUM(points) AS used FROM votes WHERE season = :season GROUP BY voter_id
+        ),
+        given AS (
+            SELECT voter_id, SUM(points) AS given FROM votes
+            WHERE season = :season AND submitter_id = :target GROUP BY voter_id
+        )
+        SELECT c.name AS "Voter", u.used AS "Total Points Used", COALESCE(g.given, 0) AS "Points to You",
+               u.used - COALESCE(g.given, 0) AS "Hate Points"
+        FROM competitors c
+        JOIN used u ON u.voter_id = c.id
+        LEFT JOIN given g ON g.voter_id = c.id
+        WHERE c.season = :season AND c.id != :target
+        ORDER BY "Points to You" DESC, c.position
+    """, **params)
+    allocation["Your Share %"] = _percent(allocation["Points to You"], allocation["Total Points Used"])
+
+    song_columns = ["Title", "Primary Artist", "Total Points", "Round"]
+    return {
+        "id": row[0],
+        "has_songs": len(history) > 0,
+        "total": int(history["Total Points"].sum()),
+        "average": float(history["Total Points"].mean()) if len(history) else float("nan"),
+        "best": best[song_columns],
+        "worst": worst[song_columns],
+        "supporters": supporters,
+        "hater_count": len(haters),
+        "haters": haters.head(5).set_index("Voter ID"),
+        "biggest_hater": breakdown,
+        "allocation": allocation,
+        "history": history.set_index("position").rename_axis(None)[["Round", "Title", "Primary Artist", "Total Points"]],
+    }
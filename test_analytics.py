@@ -0,0 +1,117 @@
+"""Player profile tables (analytics.hate_matrix / allocation_matrix) against the original per-voter loops.
+
+    python -m pytest test_analytics.py
+"""
+import os
+
+import pytest
+
+import analytics
+from loader import find_seasons, load_season
+
+EXPORTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+SEASONS = list(find_seasons(EXPORTS).values())
+
+
+def _plain(data):
+    """The season as plain string IDs, the way the dashboard's loops read it."""
+    frames = {name: frame.copy() for name, frame in data.items()}
+    for name, frame in frames.items():
+        for column in ("ID", "Voter ID", "Submitter ID", "Round ID", "Spotify URI"):
+            if column in frame:
+                frame[column] = frame[column].astype(str)
+    return frames
+
+
+def _baseline_haters(data, player_id):
+    """Hate = points a voter had in a round minus points given to the player, over rounds where the player had songs."""
+    votes, submissions, rounds, competitors = data["votes"], data["submissions"], data["rounds"], data["competitors"]
+    songs = submissions[submissions["Submitter ID"] == player_id]
+    if songs.empty:
+        return []
+    haters = []
+    for hater_id, name in zip(competitors["ID"], competitors["Name"]):
+        if hater_id == player_id:
+            continue
+        hate = available = given = 0
+        for round_id in rounds["ID"]:
+            round_votes = votes[(votes["Voter ID"] == hater_id) & (votes["Round ID"] == round_id)]
+            if round_votes.empty:
+                continue
+            total = int(round_votes["Points Assigned"].sum())
+            uris = songs.loc[songs["Round ID"] == round_id, "Spotify URI"]
+            to_player = int(round_votes.loc[round_votes["Spotify URI"].isin(uris), "Points Assigned"].sum())
+            available += total
+            given += to_player
+            if len(uris):
+                hate += total - to_player
+        if hate > 1:
+            haters.append((name, hate, available, given))
+    return sorted(haters, key=lambda hater: hater[1], reverse=True)
+
+
+def _uri_only_allocation(data, player_id):
+    """{voter: points to the player} with votes matched to the player's songs by Spotify URI alone."""
+    votes, submissions = data["votes"], data["submissions"]
+    uris = submissions.loc[submissions["Submitter ID"] == player_id, "Spotify URI"]
+    allocation = {}
+    for voter_id, name in zip(data["competitors"]["ID"], data["competitors"]["Name"]):
+        voter_votes = votes[votes["Voter ID"] == voter_id]
+        if voter_id != player_id and not voter_votes.empty:
+            allocation[name] = int(voter_votes.loc[voter_votes["Spotify URI"].isin(uris), "Points Assigned"].sum())
+    return allocation
+
+
+def _resubmitted_points(data, player_id):
+    """{voter: points} on songs that share a URI with one of the player's songs but were submitted in another round."""
+    votes, submissions = data["votes"], data["submissions"]
+    songs = submissions[submissions["Submitter ID"] == player_id]
+    own = set(zip(songs["Spotify URI"], songs["Round ID"]))
+    voters = dict(zip(data["competitors"]["ID"], data["competitors"]["Name"]))
+    elsewhere = votes[votes["Spotify URI"].isin(songs["Spotify URI"])]
+    points = {}
+    for voter_id, uri, round_id, assigned in zip(
+        elsewhere["Voter ID"], elsewhere["Spotify URI"], elsewhere["Round ID"], elsewhere["Points Assigned"]
+    ):
+        if (uri, round_id) not in own:
+            points[voters[voter_id]] = points.get(voters[voter_id], 0) + int(assigned)
+    return points
+
+
+@pytest.fixture(scope="module", params=SEASONS)
+def season(request):
+    data = load_season(request.param)
+    facts = analytics.build_facts(**data)
+    hate = analytics.hate_matrix(facts, data["rounds"], data["competitors"])
+    allocation = analytics.allocation_matrix(facts, data["competitors"])
+    return _plain(data), analytics.player_profiles(facts, hate, allocation, data["rounds"], data["competitors"])
+
+
+def test_haters_match_the_per_round_loop(season):
+    data, profiles = season
+    for name, player_id in profiles["players"].items():
+        expected, profile = _baseline_haters(data, player_id), analytics.player_profile(profiles, name)
+        assert profile["hater_count"] == len(expected), name
+        haters = profile["haters"][["Hater", "Hate Points", "Points Available", "Points Given to You"]]
+        assert [tuple(row) for row in haters.itertuples(index=False)] == expected[:5], name
+
+
+def test_allocation_differs_from_a_uri_join_only_for_resubmitted_songs(season):
+    data, profiles = season
+    for name, player_id in profiles["players"].items():
+        allocation = analytics.player_profile(profiles, name)["allocation"]
+        resubmitted = _resubmitted_points(data, player_id)
+        uri_only = _uri_only_allocation(data, player_id)
+        assert sorted(allocation["Voter"]) == sorted(uri_only), name
+        for voter, points, used in zip(allocation["Voter"], allocation["Points to You"], allocation["Total Points Used"]):
+            # A URI-only join also credits the player with votes on the same song submitted in another round
+            assert uri_only[voter] - points == resubmitted.get(voter, 0), (name, voter)
+            assert 0 <= points <= used
+
+
+def test_exports_include_votes_on_resubmitted_songs():
+    """Keeps the allocation check above meaningful: some export has votes the two joins attribute differently."""
+    def differing(path):
+        data = _plain(load_season(path))
+        return any(_resubmitted_points(data, player_id) for player_id in data["competitors"]["ID"])
+    assert any(differing(path) for path in SEASONS)
@@ -0,0 +1,78 @@
+"""Applying appended rows (incremental.refresh_state) must give what a full reload gives.
+
+    python -m pytest test_incremental.py
+"""
+import pandas as pd
+import pytest
+
+import analytics
+from generate_league import generate_league, write_league
+from incremental import load_state, refresh_state
+
+LEAGUE = generate_league(players=30, rounds=8, votes=1500, seed=7)
+
+
+def _export(path, rounds, votes=None):
+    """The league as exported after `rounds` rounds, with only the first `votes` votes of those rounds."""
+    round_ids = set(LEAGUE["rounds"]["ID"].iloc[:rounds])
+    league = {
+        "rounds": LEAGUE["rounds"].iloc[:rounds],
+        "submissions": LEAGUE["submissions"][LEAGUE["submissions"]["Round ID"].isin(round_ids)],
+        "votes": LEAGUE["votes"][LEAGUE["votes"]["Round ID"].isin(round_ids)].iloc[:votes],
+        "competitors": LEAGUE["competitors"],
+    }
+    write_league(path, league)
+
+
+def _assert_same_state(state, full):
+    for group in ("data", "facts"):
+        assert state[group].keys() == full[group].keys()
+        for name, frame in full[group].items():
+            if isinstance(frame, pd.DataFrame):
+                pd.testing.assert_frame_equal(state[group][name], frame, check_categorical=False, obj=f"{group}[{name}]")
+            else:
+                pd.testing.assert_series_equal(state[group][name], frame, obj=f"{group}[{name}]")
+
+
+@pytest.mark.parametrize("start, end", [
+    ((2, None), (3, None)),  # a new round with its submissions and votes
+    ((3, 400), (3, None)),  # votes still coming in for the last round
+    ((2, None), (8, None)),  # several rounds at once
+])
+def test_refresh_matches_full_load(tmp_path, start, end):
+    _export(tmp_path, *start)
+    state = load_state(tmp_path)
+    _export(tmp_path, *end)
+    refreshed = refresh_state(state, tmp_path)
+    assert refreshed["update"] == "appended"
+    assert refreshed["previous"] == state["signature"]
+    _assert_same_state(refreshed, load_state(tmp_path))
+
+
+def test_tables_catch_up_from_appended_rows(tmp_path):
+    _export(tmp_path, 3, 300)
+    state = load_state(tmp_path)
+    board, counts, points = (
+        analytics.leaderboard(state["facts"]), analytics.snub_counts(state["facts"]), analytics.heatmap_points(state["facts"])
+    )
+    _export(tmp_path, 5, None)
+    state = refresh_state(state, tmp_path)
+    facts, changes = state["facts"], state["changes"]
+    pd.testing.assert_frame_equal(analytics.extend_leaderboard(board, changes), analytics.leaderboard(facts))
+    pd.testing.assert_frame_equal(analytics.extend_snub_counts(counts, changes), analytics.snub_counts(facts))
+    pd.testing.assert_frame_equal(
+        analytics.heatmap_matrix(analytics.extend_heatmap_points(points, changes, facts["players"])),
+        analytics.voting_heatmap(facts),
+    )
+
+
+def test_changed_history_reloads(tmp_path):
+    _export(tmp_path, 3, None)
+    state = load_state(tmp_path)
+    _export(tmp_path, 4, None)
+    votes = tmp_path / "votes.csv"
+    lines = votes.read_text().splitlines(keepends=True)
+    votes.write_text("".join([lines[0], lines[2], lines[1], *lines[3:]]))
+    refreshed = refresh_state(state, tmp_path)
+    assert refreshed["update"] == "full"
+    _assert_same_state(refreshed, load_state(tmp_path))
@@ -0,0 +1,100 @@
+"""The SQLite backend (store.py) must answer every query like the pandas path (analytics.py).
+
+    python -m pytest test_store.py
+"""
+import os
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+import analytics
+import store
+from loader import find_seasons, load_season
+
+EXPORTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+SEASONS = list(find_seasons(EXPORTS).values())
+
+
+def _same(left, right, index=False):
+    """Equal cell by cell once both sides are plain strings; dtypes differ between the backends."""
+    def normalize(df):
+        df = df.reset_index(drop=not index).astype(object)
+        return df.where(df.notna(), "").astype(str)
+    pd.testing.assert_frame_equal(normalize(left), normalize(right))
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    with closing(store.connect(str(tmp_path_factory.mktemp("store") / "league.sqlite"))) as conn:
+        yield conn
+
+
+@pytest.fixture(scope="module", params=SEASONS)
+def season(request, conn):
+    path = request.param
+    store.ingest_season(conn, path)
+    data = load_season(path)
+    return path, data, analytics.build_facts(**data)
+
+
+def test_ingest_is_skipped_for_an_unchanged_export(conn, season):
+    assert not store.ingest_season(conn, season[0])
+
+
+def test_season_tables(conn, season):
+    path, data, facts = season
+    _same(analytics.leaderboard(facts), store.leaderboard(conn, path))
+    _same(analytics.snub_rates(facts), store.snub_rates(conn, path))
+    _same(analytics.round_participation(data["submissions"], data["rounds"]), store.round_participation(conn, path))
+    _same(analytics.top_songs(data["submissions"]), store.top_songs(conn, path))
+    _same(analytics.top_artists(data["submissions"]), store.top_artists(conn, path))
+    _same(analytics.round_points(facts, data["rounds"]), store.round_points(conn, path))
+    assert analytics.season_metrics(facts, data["competitors"]) == store.season_metrics(conn, path)
+    heatmap = analytics.heatmap_matrix(store.heatmap_points(conn, path))
+    pd.testing.assert_frame_equal(analytics.voting_heatmap(facts), heatmap, check_dtype=False)
+
+
+@pytest.mark.parametrize("query, page", [
+    ({}, 1),
+    ({"text": "the"}, 1),
+    ({"text": "lo"}, 1),
+    ({"text": "ñ"}, 1),
+    ({"text": "café"}, 1),
+    ({"text": "a"}, 2),
+])
+def test_explore(conn, season, query, page):
+    path, _, facts = season
+    index = analytics.explore_index(facts)
+    matches = analytics.explore_search(index, **query)
+    rows, total = store.explore_page(conn, path, page, 5, **query)
+    assert total == len(matches)
+    _same(analytics.explore_page(index, matches, page, 5), rows, index=True)
+
+
+def test_explore_filters(conn, season):
+    path, _, facts = season
+    table = analytics.explore_table(facts)
+    username, artist = table["Username"].dropna().iloc[0], table["Artist Name"].dropna().iloc[0]
+    index = analytics.explore_index(facts)
+    for query in ({"username": username}, {"artist": artist}, {"username": username, "text": "a"}):
+        matches = analytics.explore_search(index, **query)
+        rows, total = store.explore_page(conn, path, 1, len(table), **query)
+        assert total == len(matches)
+        _same(analytics.explore_page(index, matches, 1, len(table)), rows, index=True)
+
+
+def test_player_profiles(conn, season):
+    path, data, facts = season
+    hate = analytics.hate_matrix(facts, data["rounds"], data["competitors"])
+    allocation = analytics.allocation_matrix(facts, data["competitors"])
+    profiles = analytics.player_profiles(facts, hate, allocation, data["rounds"], data["competitors"])
+    assert sorted(profiles["players"]) == store.player_names(conn, path)
+    for name in profiles["players"]:
+        expected, profile = analytics.player_profile(profiles, name), store.player_profile(conn, path, name)
+        for key in ("id", "has_songs", "total", "hater_count"):
+            assert expected[key] == profile[key], (name, key)
+        for key in ("best", "worst", "supporters", "biggest_hater", "allocation"):
+            _same(expected[key], profile[key])
+        for key in ("haters", "history"):
+            _same(expected[key], profile[key], index=True)